@@ -3,27 +3,60 @@ import os
 import re
 import json
 import logging
+import time
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
-from langchain_community.chat_models import ChatLlamaCpp
-from langchain_core.messages import HumanMessage
-from registry import TOOLS, TOOL_SPEC
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from llama_cpp import Llama
+from registry import TOOLS, TOOL_SPEC_JSON
 from settings import (
-    LLAMA_MODEL_PATH, LLAMA_CTX, LLAMA_THREADS, LLAMA_MAX_TOKENS, LOG_LEVEL
+    LLAMA_MODEL_PATH, LLAMA_CTX, LLAMA_THREADS, LLAMA_MAX_TOKENS,
+    LLAMA_N_BATCH, LLAMA_N_GPU_LAYERS, LLAMA_BATCH_WINDOW_MS, LLAMA_MAX_BATCH,
+    LOG_LEVEL, FAST_PATH
 )
 
 logging.basicConfig(level=getattr(logging, LOG_LEVEL, logging.INFO),
                     format="%(asctime)s %(levelname)s: %(message)s")
 log = logging.getLogger("ctd-react-agent")
 
-SYSTEM_PROMPT = f"""당신은 CTD 문서 생성 및 검증을 위한 ReAct 스타일 에이전트입니다.
+# LLM 응답 파싱용 정규식 (스텝마다 재사용)
+_ACTION_CODEBLOCK_RE = re.compile(r"Action:\s*```json\s*(\{.*?\})\s*```", re.S)
+_ACTION_BRACE_RE = re.compile(r"Action:\s*(\{)", re.S)
+_THOUGHT_RE = re.compile(r"Thought:\s*(.+?)(?:\n|Action:|$)", re.S)
+_ACTION_BLOCK_RE = re.compile(r"Action:\s*(.*?)(?:\n\n|Observation:|$)", re.S)
+_FINAL_RE = re.compile(r"FinalAnswer:\s*(.+)", re.S)
+_DECODER = json.JSONDecoder()
+
+# LLM에 다시 보낼 최근 Observation/알림 메시지 수
+_HISTORY_KEEP = 2
+
+# 모드 판단 키워드 (소문자로 변환된 경로/텍스트에 단일 alternation으로 검색)
+_VALIDATE_FNAME_RE = re.compile("|".join(map(re.escape, [
+    "review", "check", "validate", "verify", "inspect", "final", "완성", "submitted", "approved", "complete", "CTD",
+])))
+_GENERATE_FNAME_RE = re.compile("|".join(map(re.escape, [
+    "template", "blank", "new", "draft", "초안", "템플릿", "empty", "실험", "연구", "data", "결과", "자료", "정보",
+])))
+_VALIDATE_TEXT_RE = re.compile("|".join(map(re.escape, [
+    "ctd", "국제공통기술문서", "common technical document", "목차", "1부", "2부", "3부",
+])))
+
+SYSTEM_PROMPT = """당신은 CTD 문서 생성 및 검증을 위한 ReAct 스타일 에이전트입니다.
 
 **⚠️  중요: 한 번에 하나의 Action만 출력하세요!**
 **⚠️  Action 실행 후 Observation을 기다려야 합니다!**
 **⚠️  여러 개의 Action을 동시에 출력하지 마세요!**
 
 다음 도구들만 사용하세요 (반드시 JSON 형식으로 지시):
-{json.dumps(TOOL_SPEC, ensure_ascii=False, indent=2)}
+{tool_spec}
 
 반드시 아래 형식을 따르세요:
 Thought: (다음에 무엇을 할지 한 줄)
@@ -73,43 +106,89 @@ FinalAnswer: PDF 경로
 - Action 다음에 바로 FinalAnswer 출력 금지
 - Observation 없이 다음 Action 출력 금지
 - 존재하지 않는 tool (예: "ReAct") 호출 금지
-"""
-
-
+""".format(tool_spec=TOOL_SPEC_JSON)
+
+
+def _msg(content: str) -> Dict[str, str]:
+    """Llama chat 메시지 (모든 메시지는 user 역할로 전달)"""
+    return {"role": "user", "content": content}
+
+
+# 시스템 메시지는 모든 run_agent 호출에서 동일 객체를 재사용.
+# 프롬프트 prefix가 매번 같으므로 llama.cpp가 해당 구간의 KV 캐시를 재사용한다.
+_SYSTEM_MSG = _msg(SYSTEM_PROMPT)
+
+
+@dataclass(slots=True)
+class AgentState:
+    """run_agent 실행 상태 (스텝 간 공유, 결과는 to_dict()로 반환)"""
+    mode: str = "generate"
+    parsed_content: str = ""
+    final_message: Optional[str] = None
+    pdf_path: Optional[str] = None
+    pdf_size: Optional[int] = None
+    module2_pdf_path: Optional[str] = None
+    module2_pdf_size: Optional[int] = None
+    modules_generated: Optional[List[Dict[str, Any]]] = None
+    report_path: Optional[str] = None
+    summary: Optional[Dict[str, Any]] = None
+    schema_check: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """설정된 필드만 딕셔너리로 변환 (기존 dict 결과 형식 유지)"""
+        out = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if value is not None:
+                out[f.name] = value
+        return out
+
+
+def _dumps(obj: Any) -> str:
+    """Observation/힌트 직렬화 (orjson 우선, 미설치 시 json)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str).decode()
+    return json.dumps(obj, ensure_ascii=False, default=str)
+
+
+def _compact(obj: Any, cap: int = 1500) -> Any:
+    """Observation용으로 긴 문자열/리스트를 미리 잘라 직렬화 비용을 줄임"""
+    if isinstance(obj, dict):
+        return {
+            k: (v[:cap] + "..." if isinstance(v, str) and len(v) > cap else _compact(v, cap))
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_compact(x, cap) for x in obj[:10]]
+    return obj
+
+
+@lru_cache(maxsize=256)
 def _extract_tool_call(text: str) -> Optional[Dict[str, Any]]:
-    """텍스트에서 도구 호출 추출 (첫 번째만)"""
+    """
+    텍스트에서 도구 호출 추출 (첫 번째만)
+
+    같은 응답 문자열은 캐시된 결과를 돌려주므로 반환 딕셔너리는 수정하지 말 것.
+    """
     # Action: 이후의 첫 번째 JSON만 추출
     # 먼저 코드 블록 형식 시도
-    m = re.search(r"Action:\s*```json\s*(\{.*?\})\s*```", text, flags=re.S)
+    m = _ACTION_CODEBLOCK_RE.search(text)
     if not m:
-        # Action: 이후부터 시작하는 JSON 찾기 (중괄호 카운팅으로 완전한 JSON 추출)
-        action_match = re.search(r'Action:\s*(\{)', text, flags=re.S)
+        # Action: 이후부터 시작하는 JSON 찾기 (raw_decode로 완전한 JSON 객체만 소비)
+        action_match = _ACTION_BRACE_RE.search(text)
         if not action_match:
             return None
 
-        # Action: 이후부터 텍스트 추출
         start_pos = action_match.start(1)
-        json_text = text[start_pos:]
-
-        # 중괄호 개수를 세어 완전한 JSON 추출
-        brace_count = 0
-        end_pos = 0
-        for i, char in enumerate(json_text):
-            if char == '{':
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end_pos = i + 1
-                    break
-
-        if end_pos == 0:
+        try:
+            obj, _end = _DECODER.raw_decode(text, start_pos)
+            return obj
+        except json.JSONDecodeError as e:
+            log.warning(f"Failed to parse tool call: {e}")
+            log.warning(f"JSON string was: {text[start_pos:start_pos + 200]}...")
             return None
 
-        json_str = json_text[:end_pos]
-    else:
-        json_str = m.group(1)
-
+    json_str = m.group(1)
     try:
         return json.loads(json_str)
     except Exception as e:
@@ -117,73 +196,61 @@ def _extract_tool_call(text: str) -> Optional[Dict[str, Any]]:
         log.warning(f"JSON string was: {json_str[:200]}...")
         return None
 
+def _run_tool(tool_obj: Any, args: Dict[str, Any], state: AgentState) -> Any:
+    """도구 실행 (registry에서 모두 (args, state) 규약으로 래핑됨)"""
+    return tool_obj(args, state)
 
-def _run_tool(tool_obj: Any, args: Dict[str, Any], state: Dict[str, Any]) -> Any:
-    """도구 실행"""
-    if hasattr(tool_obj, "invoke"):
-        return tool_obj.invoke(args)
-    try:
-        return tool_obj(args, state)
-    except TypeError:
-        try:
-            return tool_obj(**(args or {}))
-        except TypeError:
-            return tool_obj()
 
-
-def _detect_mode(file_paths: Optional[List[str]], texts: Optional[List[str]], llama=None) -> str:
+def _detect_mode(file_paths: Optional[List[str]], texts: Optional[List[str]], llama=None,
+                 lower_paths: Optional[List[str]] = None) -> str:
     """
     입력을 분석하여 작업 모드를 자동 판단
 
-    1차 판단: 파일명 키워드 (명시적 의도)
-    2차 판단: 확장자 기반 (PDF → 검증, Excel → 생성)
+    1차 판단: 확장자 기반 (PDF → 검증, Excel → 생성)
+    2차 판단: 파일명/텍스트 키워드 (확장자로 판단이 안 되는 경우)
     3차 판단: LLM 분석 (불확실한 경우만)
 
+    Args:
+        lower_paths: 소문자로 변환된 file_paths (호출자가 이미 계산했으면 재사용)
+
     Returns:
         "generate" | "validate"
     """
-    file_paths = file_paths or []
+    if lower_paths is None:
+        lower_paths = [p.lower() for p in file_paths or []]
     texts = texts or []
 
-    # 1단계: 파일명 키워드 우선 확인 (명확한 사용자 의도)
-    for path in file_paths:
-        path_lower = path.lower()
+    # 1단계: 확장자 기반 판단 (대부분 여기서 결정됨)
+    for path_lower in lower_paths:
+        # PDF는 기본적으로 검증 모드 (완성된 문서)
+        if path_lower.endswith(".pdf"):
+            log.info(f"🎯 Mode detection: 'validate' (PDF extension - assumed complete document)")
+            return "validate"
+
+        # Excel은 기본적으로 생성 모드 (원시 데이터)
+        if path_lower.endswith((".xlsx", ".xls", ".csv")):
+            log.info(f"🎯 Mode detection: 'generate' (Excel extension - assumed raw data)")
+            return "generate"
 
+    # 2단계: 파일명 키워드 확인 (확장자가 모호한 경우)
+    for path_lower in lower_paths:
         # 검증 모드 키워드 (파일명에 명시된 경우)
-        validate_keywords = ["review", "check", "validate", "verify", "inspect", "final", "완성", "submitted", "approved","complete","CTD"]
-        if any(keyword in path_lower for keyword in validate_keywords):
+        if _VALIDATE_FNAME_RE.search(path_lower):
             log.info(f"🎯 Mode detection: 'validate' (filename keyword)")
             return "validate"
 
         # 생성 모드 키워드 (파일명에 명시된 경우)
-        generate_keywords = ["template", "blank", "new", "draft", "초안", "템플릿", "empty","실험","연구","data","결과","자료","정보"]
-        if any(keyword in path_lower for keyword in generate_keywords):
+        if _GENERATE_FNAME_RE.search(path_lower):
             log.info(f"🎯 Mode detection: 'generate' (filename keyword)")
             return "generate"
 
     # 텍스트 키워드 분석
     for text in texts:
-        text_lower = text.lower()
-        validate_keywords = ["ctd","국제공통기술문서","common technical document","목차","1부","2부","3부"]
-        if any(keyword in text_lower for keyword in validate_keywords):
+        if _VALIDATE_TEXT_RE.search(text.lower()):
             log.info(f"🎯 Mode detection: 'validate' (text keyword)")
             return "validate"
 
-    # 2단계: 확장자 기반 판단 (일반적인 사용 패턴)
-    for path in file_paths:
-        path_lower = path.lower()
-
-        # PDF는 기본적으로 검증 모드 (완성된 문서)
-        if path_lower.endswith(".pdf"):
-            log.info(f"🎯 Mode detection: 'validate' (PDF extension - assumed complete document)")
-            return "validate"
-
-        # Excel은 기본적으로 생성 모드 (원시 데이터)
-        if path_lower.endswith((".xlsx", ".xls", ".csv")):
-            log.info(f"🎯 Mode detection: 'generate' (Excel extension - assumed raw data)")
-            return "generate"
-
-    # 3단계: LLM 분석 (확장자만으로 판단 어려운 경우)
+    # 3단계: LLM 분석 (확장자/키워드만으로 판단 어려운 경우)
     # 현재는 확장자 기반으로 충분하므로 LLM 분석은 선택적으로만 사용
     # if llama and file_paths:
     #     ... (주석 처리)
@@ -193,6 +260,188 @@ def _detect_mode(file_paths: Optional[List[str]], texts: Optional[List[str]], ll
     return "generate"
 
 
+def _forced_call(mode: str, step: int, file_paths: Optional[List[str]],
+                 state: AgentState, lower_paths: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    모드별 고정 워크플로우에서 해당 스텝의 도구 호출 생성
+
+    Returns:
+        도구 호출 딕셔너리. 워크플로우가 끝났거나 진행할 수 없으면 None
+        (이때 state.final_message가 설정됨)
+    """
+    # 검증 모드 강제 순서
+    if mode == "validate":
+        if step == 1:
+            # 첫 단계: 무조건 파싱
+            log.info(f"🔧 FORCED TOOL (step {step}): parse_documents")
+            return {"tool": "parse_documents", "args": {"file_paths": file_paths}}
+        if step == 2:
+            # 두 번째 단계: 무조건 검증 리포트
+            log.info(f"🔧 FORCED TOOL (step {step}): generate_validation_report")
+            return {
+                "tool": "generate_validation_report",
+                "args": {"output_format": "markdown", "output_dir": "output"}
+            }
+        # 3단계 이상이면 종료
+        log.info(f"🔧 FORCED COMPLETION: All validation steps done (step {step})")
+        state.final_message = state.report_path or "Validation completed"
+        return None
+
+    # 생성 모드 강제 순서
+    if step == 1:
+        # Excel/CSV 파일 찾기
+        file_paths = file_paths or []
+        if lower_paths is None:
+            lower_paths = [p.lower() for p in file_paths]
+        excel_file = next(
+            (f for f, f_lower in zip(file_paths, lower_paths) if f_lower.endswith(('.xlsx', '.xls', '.csv'))),
+            None
+        )
+        if excel_file:
+            log.info(f"🔧 FORCED TOOL (step {step}): generate_all_modules")
+            return {
+                "tool": "generate_all_modules",
+                "args": {"excel_path": excel_file, "output_dir": "output"}
+            }
+        # Excel/CSV가 없으면 종료
+        log.error(f"❌ No Excel/CSV file found for generation mode")
+        state.final_message = "Error: No Excel/CSV file found"
+        return None
+    if step == 2:
+        log.info(f"🔧 FORCED TOOL (step {step}): save_as_pdf")
+        return {"tool": "save_as_pdf", "args": {"output_dir": "output"}}
+    # 3단계 이상이면 종료
+    log.info(f"🔧 FORCED COMPLETION: All generation steps done (step {step})")
+    state.final_message = state.pdf_path or "Generation completed"
+    return None
+
+
+def _fast_path_ready(mode: str, file_paths: Optional[List[str]], lower_paths: List[str]) -> bool:
+    """고정 워크플로우를 LLM 없이 끝까지 진행할 입력이 있는지 (없으면 LLM 루프로 진행)"""
+    if mode == "validate":
+        return bool(file_paths)
+    return any(p.endswith(('.xlsx', '.xls', '.csv')) for p in lower_paths)
+
+
+# LLM 추론과 겹쳐 미리 실행해도 되는 도구 (외부 상태를 바꾸지 않고 같은 입력이면 같은 결과)
+# generate_all_modules(Solar 호출 + YAML 기록), save_as_pdf(PDF 기록) 등은 제외
+_SPECULATIVE_TOOLS = frozenset({"parse_documents"})
+
+
+def _call_key(call: Dict[str, Any]) -> tuple:
+    """도구 호출 비교용 키 (인자 순서/None/단일 경로 문자열 표기 차이는 무시)"""
+    args = call.get("args") or {}
+    items = []
+    for k, v in args.items():
+        if v is None:
+            continue
+        if k == "file_paths" and isinstance(v, str):
+            v = [v]
+        items.append((k, _dumps(v)))
+    return call.get("tool"), tuple(sorted(items))
+
+
+# 프로세스 전역 Llama 인스턴스 (LLAMA_* 설정은 최초 로드 시 한 번만 반영됨)
+_llama = None
+_llama_lock = threading.Lock()
+
+
+def _get_llama() -> Llama:
+    """Llama 모델 인스턴스 가져오기 (싱글톤, 스레드 안전)"""
+    global _llama
+    if _llama is None:
+        with _llama_lock:
+            if _llama is None:
+                log.info("┏" + "━"*78 + "┓")
+                log.info("┃ 🧠 LOADING LLAMA MODEL")
+                log.info("┗" + "━"*78 + "┛")
+                log.info(f"   Model: {LLAMA_MODEL_PATH}")
+                log.info(f"   Context: {LLAMA_CTX}, Threads: {LLAMA_THREADS}")
+                log.info(f"   Batch: {LLAMA_N_BATCH}, GPU layers: {LLAMA_N_GPU_LAYERS}")
+                _llama = Llama(
+                    model_path=LLAMA_MODEL_PATH,
+                    n_ctx=LLAMA_CTX,
+                    n_threads=LLAMA_THREADS,
+                    n_batch=LLAMA_N_BATCH,
+                    n_gpu_layers=LLAMA_N_GPU_LAYERS,
+                    use_mmap=False,
+                    verbose=False,
+                )
+                log.info("✅ Llama model loaded successfully\n")
+    return _llama
+
+
+class _LlamaBatcher:
+    """
+    Llama 요청을 단일 워커 스레드에서 순서대로 처리
+
+    다중 시퀀스 디코딩은 하지 않는다 (llama-cpp-python 고수준 API 미지원).
+    이미 다른 요청이 대기 중일 때만 짧은 윈도우 동안 더 모아, 같은 메시지 목록은
+    한 번만 추론한다 (temperature=0이므로 결과 동일). 혼자 들어온 요청은 기다리지 않는다.
+    워커가 컨텍스트를 독점하므로 별도 락이 필요 없다.
+    """
+
+    def __init__(self, window_ms: int, max_batch: int):
+        self._window = window_ms / 1000
+        self._max_batch = max(1, max_batch)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, messages: List[Dict[str, str]]) -> str:
+        """메시지 목록을 큐에 넣고 생성된 텍스트를 기다림"""
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="ctd-llama-batcher", daemon=True)
+                    self._worker.start()
+        fut: Future = Future()
+        # 호출자가 이후 history를 수정해도 영향 없도록 스냅샷 전달
+        self._queue.put((list(messages), fut))
+        return fut.result()
+
+    def _collect(self) -> List[tuple]:
+        batch = [self._queue.get()]
+        if self._queue.empty():
+            # 대기 중인 요청이 없으면 윈도우 지연 없이 바로 처리
+            return batch
+        deadline = time.monotonic() + self._window
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if len(batch) > 1:
+                log.info(f"🧺 Llama batch: {len(batch)} requests")
+            done: Dict[str, str] = {}
+            for messages, fut in batch:
+                key = _dumps(messages)
+                try:
+                    if key not in done:
+                        completion = _get_llama().create_chat_completion(
+                            messages=messages,
+                            temperature=0.0,
+                            max_tokens=LLAMA_MAX_TOKENS,
+                            stop=["\nObservation:"],
+                        )
+                        done[key] = completion["choices"][0]["message"].get("content") or ""
+                    fut.set_result(done[key])
+                except Exception as e:
+                    fut.set_exception(e)
+
+
+# 이전 호출과 겹치는 토큰 prefix(시스템 프롬프트 + 입력)는 KV 캐시에서 재사용됨
+_llama_batcher = _LlamaBatcher(LLAMA_BATCH_WINDOW_MS, LLAMA_MAX_BATCH)
+
+
 def run_agent(file_paths=None, texts=None, max_steps: int = 10) -> Dict[str, Any]:
     """
     ReAct 에이전트 실행
@@ -205,232 +454,209 @@ def run_agent(file_paths=None, texts=None, max_steps: int = 10) -> Dict[str, Any
     Returns:
         실행 결과 딕셔너리
     """
-    state: Dict[str, Any] = {}
+    state = AgentState()
 
-    # Llama 모델 로드
-    log.info("┏" + "━"*78 + "┓")
-    log.info("┃ 🧠 LOADING LLAMA MODEL")
-    log.info("┗" + "━"*78 + "┛")
-    log.info(f"   Model: {LLAMA_MODEL_PATH}")
-    log.info(f"   Context: {LLAMA_CTX}, Threads: {LLAMA_THREADS}")
-    try:
-        llama = ChatLlamaCpp(
-            model_path=LLAMA_MODEL_PATH,
-            n_ctx=LLAMA_CTX,
-            n_threads=LLAMA_THREADS,
-            temperature=0.0,
-            max_tokens=LLAMA_MAX_TOKENS,
-            verbose=False,
-        )
-        log.info("✅ Llama model loaded successfully\n")
-    except Exception as e:
-        log.error(f"❌ Failed to load Llama model: {e}")
-        return {"ok": False, "error": str(e)}
-
-    # 모드 자동 판단
+    # 모드 자동 판단 (확장자/키워드 기반이므로 LLM 불필요)
     log.info("┏" + "━"*78 + "┓")
     log.info("┃ 🎯 MODE DETECTION")
     log.info("┗" + "━"*78 + "┛")
-    mode = _detect_mode(file_paths, texts, llama)
-    state["mode"] = mode
+    lower_paths = [p.lower() for p in file_paths or []]
+    mode = _detect_mode(file_paths, texts, None, lower_paths)
+    state.mode = mode
     log.info(f"   Selected Mode: {mode.upper()}")
     log.info(f"   Files: {file_paths or []}")
     log.info(f"   Texts: {texts or []}\n")
 
+    # 고정 워크플로우에 필요한 입력 파일이 없으면 (예: texts만 전달) 기존처럼 LLM이 진행
+    fast_path = FAST_PATH and _fast_path_ready(mode, file_paths, lower_paths)
+
+    # Llama 모델 로드 (프로세스 내 최초 1회, 고정 워크플로우에서는 불필요)
+    try:
+        if not fast_path:
+            _get_llama()
+    except Exception as e:
+        log.error(f"❌ Failed to load Llama model: {e}")
+        return {"ok": False, "error": str(e)}
+
     user_hint = {"file_paths": file_paths or [], "texts": texts or [], "mode": mode}
-    history: List[HumanMessage] = [
-        HumanMessage(content=SYSTEM_PROMPT),
-        HumanMessage(content=f"Inputs: {json.dumps(user_hint, ensure_ascii=False)}")
+    history: List[Dict[str, str]] = [
+        _SYSTEM_MSG,
+        _msg(f"Inputs: {_dumps(user_hint)}")
     ]
 
-    for step in range(1, max_steps + 1):
-        log.info(f"\n{'━'*80}")
-        log.info(f"🔄 STEP {step}/{max_steps}")
-        log.info(f"{'━'*80}")
-
-        ai = llama.invoke(history)
-        text = getattr(ai, "content", "")
-
-        # Thought 추출 및 출력
-        thought_match = re.search(r"Thought:\s*(.+?)(?:\n|Action:|$)", text, flags=re.S)
-        if thought_match:
-            thought = thought_match.group(1).strip()
-            log.info(f"💭 THOUGHT: {thought}")
-
-        # Action 추출 및 출력
-        action_match = re.search(r"Action:\s*(.*?)(?:\n\n|Observation:|$)", text, flags=re.S)
-        if action_match:
-            action = action_match.group(1).strip()
-            log.info(f"⚡ ACTION:\n{action}")
-
-        # FinalAnswer 체크
-        m_final = re.search(r"FinalAnswer:\s*(.+)", text, flags=re.S)
-        if m_final and not _extract_tool_call(text):
-            final_msg = m_final.group(1).strip()
-            state["final_message"] = final_msg
-            log.info(f"\n{'🎯'*40}")
-            log.info(f"✅ FINAL ANSWER: {final_msg}")
-            log.info(f"{'🎯'*40}\n")
-            break
-
-        # 도구 호출 추출
-        call = _extract_tool_call(text)
-        if not call:
-            # 힌트를 강제로 실행 (LLM이 판단하지 않고 바로 실행)
-            mode = state.get("mode", "generate")
-
-            log.warning(f"⚠️  No tool call extracted, providing forced hint (step {step}, mode {mode})")
-
-            # 검증 모드 강제 순서
-            if mode == "validate":
-                if step == 1:
-                    # 첫 단계: 무조건 파싱
-                    call = {
-                        "tool": "parse_documents",
-                        "args": {"file_paths": file_paths}
-                    }
-                    log.info(f"🔧 FORCED TOOL (step {step}): parse_documents")
-                elif step == 2:
-                    # 두 번째 단계: 무조건 검증 리포트
-                    call = {
-                        "tool": "generate_validation_report",
-                        "args": {"output_format": "markdown", "output_dir": "output"}
-                    }
-                    log.info(f"🔧 FORCED TOOL (step {step}): generate_validation_report")
-                else:
-                    # 3단계 이상이면 종료
-                    log.info(f"🔧 FORCED COMPLETION: All validation steps done (step {step})")
-                    state["final_message"] = state.get("report_path", "Validation completed")
+    # 추측 실행은 LLM 루프에서만 의미가 있음 (LLM 추론과 다음 도구 실행을 겹침)
+    # 고정 워크플로우(기본값)에는 겹칠 LLM 추론이 없고, 각 도구가 이전 도구 결과에 의존하므로 풀을 만들지 않음
+    # 풀은 run_agent 호출마다 따로 두고, 종료 경로와 무관하게 정리
+    spec_pool = None if fast_path else ThreadPoolExecutor(max_workers=1, thread_name_prefix="ctd-spec-tool")
+    try:
+        for step in range(1, max_steps + 1):
+            log.info(f"\n{'━'*80}")
+            log.info(f"🔄 STEP {step}/{max_steps}")
+            log.info(f"{'━'*80}")
+
+            spec_future = None
+            if fast_path:
+                # 고정 워크플로우: LLM 호출 없이 (mode, step)으로 바로 도구 결정
+                call = _forced_call(state.mode, step, file_paths, state, lower_paths)
+                if not call:
                     break
-
-            # 생성 모드 강제 순서
             else:
-                if step == 1 and file_paths:
-                    # Excel/CSV 파일 찾기
-                    excel_file = next((f for f in file_paths if f.endswith(('.xlsx', '.xls', '.csv'))), None)
-                    if excel_file:
-                        call = {
-                            "tool": "generate_all_modules",
-                            "args": {"excel_path": excel_file, "output_dir": "output"}
-                        }
-                        log.info(f"🔧 FORCED TOOL (step {step}): generate_all_modules")
-                    else:
-                        # Excel/CSV가 없으면 종료
-                        log.error(f"❌ No Excel/CSV file found for generation mode")
-                        state["final_message"] = "Error: No Excel/CSV file found"
-                        break
-                elif step == 2:
-                    call = {"tool": "save_as_pdf", "args": {"output_dir": "output"}}
-                    log.info(f"🔧 FORCED TOOL (step {step}): save_as_pdf")
-                else:
-                    # 3단계 이상이면 종료
-                    log.info(f"🔧 FORCED COMPLETION: All generation steps done (step {step})")
-                    state["final_message"] = state.get("pdf_path", "Generation completed")
+                # 시스템 프롬프트 + 입력 + 최근 메시지만 유지 (스텝마다 prefill 길이 고정)
+                if len(history) > 2 + _HISTORY_KEEP:
+                    del history[2:-_HISTORY_KEEP]
+
+                # 워크플로우상 다음 도구가 읽기 전용이면 LLM 추론과 겹쳐서 미리 실행 (state는 사본 전달)
+                spec_call = _forced_call(state.mode, step, file_paths, replace(state), lower_paths)
+                if spec_call and spec_call["tool"] in _SPECULATIVE_TOOLS and TOOLS.get(spec_call["tool"]):
+                    spec_future = spec_pool.submit(
+                        _run_tool, TOOLS[spec_call["tool"]], spec_call["args"] or {}, replace(state)
+                    )
+
+                # 동시 요청은 배처가 모아서 처리 (llama.cpp 컨텍스트는 배처 워커만 사용)
+                text = _llama_batcher.submit(history)
+
+                # Thought 추출 및 출력
+                thought_match = _THOUGHT_RE.search(text)
+                if thought_match:
+                    thought = thought_match.group(1).strip()
+                    log.info(f"💭 THOUGHT: {thought}")
+
+                # Action 추출 및 출력
+                action_match = _ACTION_BLOCK_RE.search(text)
+                if action_match:
+                    action = action_match.group(1).strip()
+                    log.info(f"⚡ ACTION:\n{action}")
+
+                # FinalAnswer 체크
+                m_final = _FINAL_RE.search(text)
+                if m_final and not _extract_tool_call(text):
+                    final_msg = m_final.group(1).strip()
+                    state.final_message = final_msg
+                    log.info(f"\n{'🎯'*40}")
+                    log.info(f"✅ FINAL ANSWER: {final_msg}")
+                    log.info(f"{'🎯'*40}\n")
                     break
 
-            # LLM에게도 알림
-            if call:
-                history.append(HumanMessage(content=f"System: Executing forced action: {json.dumps(call, ensure_ascii=False)}"))
-            # continue 대신 call을 직접 실행하도록 아래로 진행
-
-        tool_name = call.get("tool")
-        args = call.get("args") or {}
-        tool_obj = TOOLS.get(tool_name)
-
-        if not tool_obj:
-            log.warning(f"⚠️  INVALID TOOL: '{tool_name}' - Available: {list(TOOLS.keys())}")
-            history.append(HumanMessage(
-                content=f"Observation: invalid tool '{tool_name}'. Available: {list(TOOLS.keys())}"
-            ))
-            continue
+                # 도구 호출 추출
+                call = _extract_tool_call(text)
+                if not call:
+                    # 힌트를 강제로 실행 (LLM이 판단하지 않고 바로 실행)
+                    mode = state.mode
+                    log.warning(f"⚠️  No tool call extracted, providing forced hint (step {step}, mode {mode})")
+                    call = _forced_call(mode, step, file_paths, state, lower_paths)
+                    if not call:
+                        break
 
-        # 도구 실행
-        log.info(f"🔧 EXECUTING TOOL: '{tool_name}'")
-        log.info(f"   Args: {json.dumps(args, ensure_ascii=False, indent=2)}")
-        try:
-            result = _run_tool(tool_obj, args, state)
-            log.info(f"✅ TOOL SUCCESS: '{tool_name}' - Result: {result.get('ok', True)}")
-            # 결과 요약 출력
-            if isinstance(result, dict):
-                if 'error' not in result:
-                    log.info(f"   📊 Result summary: {str(result)[:200]}...")
-        except Exception as e:
-            result = {"ok": False, "error": str(e)}
-            log.error(f"❌ TOOL FAILED: '{tool_name}' - Error: {e}")
-
-        # 파싱 결과를 state에 저장 (검증에 활용)
-        if tool_name == "parse_documents" and isinstance(result, dict) and result.get("ok"):
-            parsed_text = ""
-            for file_result in result.get("results", []):
-                # Upstage 파싱 결과에서 텍스트 추출
-                if "text" in file_result:
-                    parsed_text += file_result["text"] + "\n\n"
-                elif "content" in file_result:
-                    parsed_text += file_result["content"] + "\n\n"
-
-            state["parsed_content"] = parsed_text
-            log.info(f"   📄 Parsed content saved to state ({len(parsed_text)} chars)")
-
-        # Observation 생성 및 로깅
-        observation = f"Observation: {json.dumps(result, ensure_ascii=False)[:2000]}"
-        log.info(f"📝 OBSERVATION: {observation[:500]}...")
-        history.append(HumanMessage(content=observation))
-
-        # 모드별 완료 처리
-        mode = state.get("mode", "generate")
-
-        if mode == "generate":
-            # 생성 모드: PDF 저장 완료시 종료
-            if tool_name == "save_as_pdf" and isinstance(result, dict) and result.get("ok"):
-                state["pdf_path"] = result.get("path")
-                state["pdf_size"] = result.get("size", 0)
-
-                # Module 2 PDF 정보도 저장
-                if result.get("module2_path"):
-                    state["module2_pdf_path"] = result.get("module2_path")
-                    state["module2_pdf_size"] = result.get("module2_size", 0)
-
-                log.info(f"\n{'🎉'*40}")
-                log.info(f"✅ CTD GENERATION COMPLETED")
-                log.info(f"📄 Complete PDF: {result.get('path')} ({result.get('size', 0):,} bytes)")
-                if result.get("module2_path"):
-                    log.info(f"📄 Module 2 PDF: {result.get('module2_path')} ({result.get('module2_size', 0):,} bytes)")
-                log.info(f"{'🎉'*40}\n")
-
-                final_msg = f"PDF saved -> Complete: {result.get('path')}"
-                if result.get("module2_path"):
-                    final_msg += f" | Module2: {result.get('module2_path')}"
-                history.append(HumanMessage(content=f"FinalAnswer: {final_msg}"))
-                break
+                    # LLM에게도 알림
+                    history.append(_msg(f"System: Executing forced action: {_dumps(call)}"))
+
+            # LLM이 미리 실행한 도구와 같은 호출을 골랐으면 그 결과를 사용
+            speculated = spec_future is not None and _call_key(call) == _call_key(spec_call)
+            if spec_future is not None and not speculated:
+                # 읽기 전용 도구이므로 기다리지 않음 (아직 시작 전이면 취소, 실행 중이면 종료 시 합류)
+                spec_future.cancel()
+
+            tool_name = call.get("tool")
+            args = call.get("args") or {}
+            tool_obj = TOOLS.get(tool_name)
+
+            if not tool_obj:
+                log.warning(f"⚠️  INVALID TOOL: '{tool_name}' - Available: {list(TOOLS.keys())}")
+                history.append(_msg(
+                    f"Observation: invalid tool '{tool_name}'. Available: {list(TOOLS.keys())}"
+                ))
+                continue
+
+            # 도구 실행
+            log.info(f"🔧 EXECUTING TOOL: '{tool_name}'")
+            log.info(f"   Args: {json.dumps(args, ensure_ascii=False, indent=2)}")
+            try:
+                result = spec_future.result() if speculated else _run_tool(tool_obj, args, state)
+                log.info(f"✅ TOOL SUCCESS: '{tool_name}' - Result: {result.get('ok', True)}")
+                # 결과 요약 출력
+                if isinstance(result, dict):
+                    if 'error' not in result:
+                        log.info(f"   📊 Result summary: {str(result)[:200]}...")
+            except Exception as e:
+                result = {"ok": False, "error": str(e)}
+                log.error(f"❌ TOOL FAILED: '{tool_name}' - Error: {e}")
+
+            # 파싱 결과를 state에 저장 (검증에 활용, 일부 파일만 실패해도 성공한 결과는 사용)
+            if tool_name == "parse_documents" and isinstance(result, dict) and result.get("results"):
+                chunks = []
+                for file_result in result.get("results", []):
+                    # Upstage 파싱 결과에서 텍스트 추출
+                    content = file_result.get("text") or file_result.get("content")
+                    if content:
+                        chunks.append(content)
+
+                parsed_text = "\n\n".join(chunks)
+                state.parsed_content = parsed_text
+                log.info(f"   📄 Parsed content saved to state ({len(parsed_text)} chars)")
+
+            # Observation 생성 및 로깅
+            observation = f"Observation: {_dumps(_compact(result))[:2000]}"
+            log.info(f"📝 OBSERVATION: {observation[:500]}...")
+            history.append(_msg(observation))
+
+            # 모드별 완료 처리
+            mode = state.mode
+
+            if mode == "generate":
+                # 생성 모드: PDF 저장 완료시 종료
+                if tool_name == "save_as_pdf" and isinstance(result, dict) and result.get("ok"):
+                    state.pdf_path = result.get("path")
+                    state.pdf_size = result.get("size", 0)
+
+                    # Module 2 PDF 정보도 저장
+                    if result.get("module2_path"):
+                        state.module2_pdf_path = result.get("module2_path")
+                        state.module2_pdf_size = result.get("module2_size", 0)
+
+                    log.info(f"\n{'🎉'*40}")
+                    log.info(f"✅ CTD GENERATION COMPLETED")
+                    log.info(f"📄 Complete PDF: {result.get('path')} ({result.get('size', 0):,} bytes)")
+                    if result.get("module2_path"):
+                        log.info(f"📄 Module 2 PDF: {result.get('module2_path')} ({result.get('module2_size', 0):,} bytes)")
+                    log.info(f"{'🎉'*40}\n")
+
+                    final_msg = f"PDF saved -> Complete: {result.get('path')}"
+                    if result.get("module2_path"):
+                        final_msg += f" | Module2: {result.get('module2_path')}"
+                    history.append(_msg(f"FinalAnswer: {final_msg}"))
+                    break
 
-            # 모든 모듈 생성 완료시 PDF 저장 힌트
-            if tool_name == "generate_all_modules" and isinstance(result, dict) and result.get("ok"):
-                state["modules_generated"] = result.get("modules", [])
-                log.info(f"📝 Modules generated: {len(result.get('modules', []))} modules")
-
-        else:  # validate 모드
-            # 검증 모드: 리포트 생성 완료시 종료
-            if tool_name == "generate_validation_report" and isinstance(result, dict) and result.get("ok"):
-                state["report_path"] = result.get("report_path")
-                state["summary"] = result.get("summary", {})
-
-                # 스키마 체크 정보 저장 (웹 UI에 전달용)
-                if "schema_check" in result:
-                    state["schema_check"] = result["schema_check"]
-
-                summary_text = f"검증 완료: 통과 {result.get('summary', {}).get('passed', 0)}, 실패 {result.get('summary', {}).get('failed', 0)}, 경고 {result.get('summary', {}).get('warnings', 0)}"
-                log.info(f"\n{'🎉'*40}")
-                log.info(f"✅ VALIDATION COMPLETED")
-                log.info(f"📊 Summary: {summary_text}")
-                log.info(f"📄 Report: {result.get('report_path')}")
-                if "schema_check" in result:
-                    schema_check = result["schema_check"]
-                    log.info(f"📋 ICH Schema: {schema_check.get('found', 0)}/{schema_check.get('total_required', 0)} items found")
-                log.info(f"{'🎉'*40}\n")
-                history.append(HumanMessage(content=f"FinalAnswer: {summary_text} | Report -> {result.get('report_path')}"))
-                break
+                # 모든 모듈 생성 완료시 PDF 저장 힌트
+                if tool_name == "generate_all_modules" and isinstance(result, dict) and result.get("ok"):
+                    state.modules_generated = result.get("modules", [])
+                    log.info(f"📝 Modules generated: {len(result.get('modules', []))} modules")
+
+            else:  # validate 모드
+                # 검증 모드: 리포트 생성 완료시 종료
+                if tool_name == "generate_validation_report" and isinstance(result, dict) and result.get("ok"):
+                    state.report_path = result.get("report_path")
+                    state.summary = result.get("summary", {})
+
+                    # 스키마 체크 정보 저장 (웹 UI에 전달용)
+                    if "schema_check" in result:
+                        state.schema_check = result["schema_check"]
+
+                    summary_text = f"검증 완료: 통과 {result.get('summary', {}).get('passed', 0)}, 실패 {result.get('summary', {}).get('failed', 0)}, 경고 {result.get('summary', {}).get('warnings', 0)}"
+                    log.info(f"\n{'🎉'*40}")
+                    log.info(f"✅ VALIDATION COMPLETED")
+                    log.info(f"📊 Summary: {summary_text}")
+                    log.info(f"📄 Report: {result.get('report_path')}")
+                    if "schema_check" in result:
+                        schema_check = result["schema_check"]
+                        log.info(f"📋 ICH Schema: {schema_check.get('found', 0)}/{schema_check.get('total_required', 0)} items found")
+                    log.info(f"{'🎉'*40}\n")
+                    history.append(_msg(f"FinalAnswer: {summary_text} | Report -> {result.get('report_path')}"))
+                    break
+    finally:
+        if spec_pool is not None:
+            spec_pool.shutdown(wait=True, cancel_futures=True)
 
-    return state
+    return state.to_dict()
 
 
 if __name__ == "__main__":
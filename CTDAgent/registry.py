@@ -1,60 +1,85 @@
 """도구 등록 시스템 (ctdmate 통합)"""
+import json
+import importlib
+import importlib.util
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional, Callable
 
-# ctdmate 통합 도구들
-try:
-    from tools.parse_upstage import parse_documents
-except Exception as e:
-    print(f"Warning: parse_upstage import failed: {e}")
-    parse_documents = None
-
-try:
-    from tools.validate_rag import validate_excel, validate_content
-except Exception as e:
-    print(f"Warning: validate_rag import failed: {e}")
-    validate_excel = None
-    validate_content = None
-
-try:
-    from tools.generate_solar import generate_ctd, generate_all_modules
-except Exception as e:
-    print(f"Warning: generate_solar import failed: {e}")
-    generate_ctd = None
-    generate_all_modules = None
-
-try:
-    from tools.save_pdf import save_as_pdf
-except Exception as e:
-    print(f"Warning: save_pdf import failed: {e}")
-    save_as_pdf = None
-
-try:
-    from tools.ctdmate_pipeline import generate_ctd_from_excel
-except Exception as e:
-    print(f"Warning: ctdmate_pipeline import failed: {e}")
-    generate_ctd_from_excel = None
-
-try:
-    from tools.generate_validation_report import generate_validation_report
-except Exception as e:
-    print(f"Warning: generate_validation_report import failed: {e}")
-    generate_validation_report = None
+# ctdmate 통합 도구들 (qdrant/E5 등 무거운 의존성 때문에 첫 호출 시점에 import)
+def _lazy(module: str, name: str) -> Optional[Callable]:
+    """모듈을 처음 호출될 때 import하는 지연 로딩 함수 생성 (모듈이 없으면 None → 미등록)"""
+    try:
+        if importlib.util.find_spec(module) is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+
+    def _call(*args, **kwargs):
+        fn = getattr(importlib.import_module(module), name)
+        return fn(*args, **kwargs)
+    _call.__name__ = name
+    return _call
+
+
+parse_documents = _lazy("tools.parse_upstage", "parse_documents")
+validate_excel = _lazy("tools.validate_rag", "validate_excel")
+validate_content = _lazy("tools.validate_rag", "validate_content")
+generate_ctd = _lazy("tools.generate_solar", "generate_ctd")
+generate_all_modules = _lazy("tools.generate_solar", "generate_all_modules")
+save_as_pdf = _lazy("tools.save_pdf", "save_as_pdf")
+generate_ctd_from_excel = _lazy("tools.ctdmate_pipeline", "generate_ctd_from_excel")
+generate_validation_report = _lazy("tools.generate_validation_report", "generate_validation_report")
 
 
 def _as_callable(fn_or_tool: Any) -> Optional[Callable]:
-    """도구를 호출 가능한 함수로 래핑"""
+    """
+    도구를 (args, state) 호출 규약의 함수로 래핑
+
+    호출 방식(invoke / (args, state) / (**args) / ())은 등록 시점에 시그니처로 한 번만 결정한다.
+    """
     if fn_or_tool is None:
         return None
     if hasattr(fn_or_tool, "invoke"):
         return lambda args=None, state=None, _tool=fn_or_tool: _tool.invoke(args or {})
-    return fn_or_tool
+
+    try:
+        params = list(inspect.signature(fn_or_tool).parameters.values())
+    except (TypeError, ValueError):
+        return fn_or_tool
+
+    positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+    if len(positional) >= 2 or any(p.kind == p.VAR_POSITIONAL for p in params):
+        return fn_or_tool
+    if params:
+        return lambda args=None, state=None, _fn=fn_or_tool: _fn(**(args or {}))
+    return lambda args=None, state=None, _fn=fn_or_tool: _fn()
 
 
 # 도구 등록
 TOOLS: Dict[str, Any] = {}
 
 if parse_documents:
-    TOOLS["parse_documents"] = _as_callable(parse_documents)
+    def _parse_documents_tool(args=None, state=None):
+        file_paths = args.get("file_paths") if isinstance(args, dict) else None
+        if not file_paths or len(file_paths) == 1:
+            return parse_documents(file_paths)
+
+        # 파일별 Upstage 호출은 네트워크 대기 위주이므로 동시에 실행
+        with ThreadPoolExecutor(max_workers=len(file_paths)) as ex:
+            per_file = list(ex.map(lambda p: parse_documents([p]), file_paths))
+
+        results = [r for res in per_file for r in res.get("results", [])]
+        errors = [res["error"] for res in per_file if not res.get("ok") and res.get("error")]
+        merged = {
+            "ok": all(res.get("ok") for res in per_file),
+            "results": results,
+            "total_files": len(file_paths)
+        }
+        if errors:
+            merged["error"] = "; ".join(errors)
+        return merged
+    TOOLS["parse_documents"] = _parse_documents_tool
 
 if validate_excel:
     def _validate_excel_tool(args=None, state=None):
@@ -113,8 +138,8 @@ if generate_validation_report:
         document_content = args.get("document_content", "") if isinstance(args, dict) else ""
 
         # state에서 파싱된 문서 내용을 가져와서 검증에 사용
-        if not document_content and state and "parsed_content" in state:
-            document_content = state.get("parsed_content", "")
+        if not document_content and state is not None:
+            document_content = getattr(state, "parsed_content", "")
 
         return generate_validation_report(
             output_dir=output_dir,
@@ -124,6 +149,10 @@ if generate_validation_report:
     TOOLS["generate_validation_report"] = _generate_validation_report_tool
 
 
+# 모든 도구를 (args, state) 규약으로 고정 (에이전트는 분기 없이 바로 호출)
+TOOLS = {name: _as_callable(tool) for name, tool in TOOLS.items()}
+
+
 # 도구 스펙 (ReAct 에이전트용)
 TOOL_SPEC = {
     "parse_documents": {
@@ -160,5 +189,6 @@ TOOL_SPEC = {
     },
 }
 
+# 시스템 프롬프트에 삽입할 도구 스펙 (import 시 한 번만 직렬화)
+TOOL_SPEC_JSON = json.dumps(TOOL_SPEC, ensure_ascii=False, indent=2)
 
-print(f"✓ {len(TOOLS)} tools registered: {list(TOOLS.keys())}")
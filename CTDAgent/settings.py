@@ -19,6 +19,13 @@ LLAMA_MODEL_PATH = os.getenv(
 LLAMA_CTX = int(os.getenv("LLAMA_CTX", "4096"))
 LLAMA_THREADS = int(os.getenv("LLAMA_THREADS", str(os.cpu_count() or 8)))
 LLAMA_MAX_TOKENS = int(os.getenv("LLAMA_MAX_TOKENS", "800"))
+LLAMA_N_BATCH = int(os.getenv("LLAMA_N_BATCH", "2048"))
+LLAMA_N_GPU_LAYERS = int(os.getenv("LLAMA_N_GPU_LAYERS", "0"))
+LLAMA_BATCH_WINDOW_MS = int(os.getenv("LLAMA_BATCH_WINDOW_MS", "20"))
+LLAMA_MAX_BATCH = int(os.getenv("LLAMA_MAX_BATCH", "8"))
+
+# 고정 워크플로우(생성/검증)는 LLM 없이 바로 도구 실행
+FAST_PATH = os.getenv("CTD_FAST_PATH", "1") == "1"
 
 # Upstage (Solar/Parser)
 UPSTAGE_API_KEY = os.getenv("UPSTAGE_API_KEY", "")
@@ -45,8 +52,3 @@ RAG_SIM_THRESHOLD = float(os.getenv("RAG_SIM_THRESHOLD", "0.78"))
 
 # Generate gate
 GENERATE_GATE = float(os.getenv("GENERATE_GATE", "0.65"))
-
-print(f"✓ Settings loaded")
-print(f"  - Llama model: {LLAMA_MODEL_PATH}")
-print(f"  - Upstage API: {'configured' if UPSTAGE_API_KEY else 'missing'}")
-print(f"  - Output dir: {OUTPUT_DIR}")
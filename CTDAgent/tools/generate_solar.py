@@ -1,5 +1,6 @@
 """Solar 기반 CTD 생성 도구 (ctdmate 통합)"""
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -108,30 +109,44 @@ def generate_all_modules(excel_path: str, output_dir: str = "output") -> Dict[st
             "modules": []
         }
 
-    # 모듈별 생성
-    modules = []
+    # 모듈별 입력 수집 (출력 파일이 같은 시트는 마지막 것만 남김, 순차 실행 시 최종 파일과 동일)
+    by_file: Dict[str, tuple] = {}
     for sheet_result in validate_result.get("results", []):
         module = sheet_result.get("module", "Unknown")
         content = sheet_result.get("normalized_content", "")
-
         if content:
-            gen_result = generate_ctd(
-                section=module,
-                prompt=content,
-                output_format="yaml"
-            )
+            module_name = f"{module.replace('.', '_')}.yaml"
+            by_file.pop(module_name, None)
+            by_file[module_name] = (module, content)
+    pairs = list(by_file.values())
+
+    def _generate_module(module: str, content: str) -> Optional[Dict[str, Any]]:
+        """모듈 하나 생성 후 파일 저장 (워커 스레드에서 실행)"""
+        gen_result = generate_ctd(
+            section=module,
+            prompt=content,
+            output_format="yaml"
+        )
+        if not gen_result.get("ok"):
+            return None
+
+        # 파일 저장
+        text = gen_result.get("text", "")
+        module_file = output_path / f"{module.replace('.', '_')}.yaml"
+        module_file.write_text(text, encoding='utf-8')
+        return {
+            "module": module,
+            "file": str(module_file),
+            "size": len(text)
+        }
 
-            if gen_result.get("ok"):
-                # 파일 저장
-                module_file = output_path / f"{module.replace('.', '_')}.yaml"
-                with open(module_file, 'w', encoding='utf-8') as f:
-                    f.write(gen_result.get("text", ""))
-
-                modules.append({
-                    "module": module,
-                    "file": str(module_file),
-                    "size": len(gen_result.get("text", ""))
-                })
+    # 모듈마다 출력 파일이 달라 동시에 실행해도 쓰기가 겹치지 않음
+    # (SolarGenerator는 로컬 모델 접근을 내부 락으로 직렬화, 싱글톤은 먼저 초기화)
+    get_solar_generator()
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = [ex.submit(_generate_module, module, content) for module, content in pairs]
+        # 결과는 시트 순서대로 수집
+        modules = [entry for entry in (fut.result() for fut in futures) if entry is not None]
 
     return {
         "ok": True,
@@ -1,13 +1,123 @@
 """검증 리포트 생성 도구"""
+import io
+import os
 import json
 import yaml
+from collections import defaultdict, deque, namedtuple
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Set, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def _load_ich_schema() -> Dict[str, Any]:
-    """ICH M1/M2 스키마 로드"""
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+# libyaml C 로더 사용 가능하면 우선 사용
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _dumps_report(data: Dict[str, Any]) -> bytes:
+    """JSON 리포트 직렬화 (orjson 우선, 미설치 시 json)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+# 스키마 항목의 필드별 병렬 리스트 (매칭 시 항목마다 dict.get 하지 않도록 캐시 생성 시 한 번만 추출)
+SchemaIndex = namedtuple("SchemaIndex", "ids ids_lower titles descriptions modules items")
+
+
+def _build_schema_index(schema_items: List[Dict[str, Any]]) -> SchemaIndex:
+    """검증 항목 리스트로 SchemaIndex 생성"""
+    ids = [item.get("id", "") for item in schema_items]
+    return SchemaIndex(
+        ids=ids,
+        ids_lower=[item_id.lower() for item_id in ids],
+        titles=[item.get("title", "") for item in schema_items],
+        descriptions=[item.get("description", "") for item in schema_items],
+        modules=[item.get("module", "Unknown") for item in schema_items],
+        items=schema_items,
+    )
+
+
+class _ItemMatcher:
+    """
+    스키마 항목의 ID/제목을 문서에서 한 번에 찾는 다중 패턴 매처
+
+    ID는 소문자 문서에서, 제목은 원문에서 찾는다 (기존 `in` 검사와 동일한 규칙).
+    pyahocorasick이 있으면 Aho-Corasick 오토마톤으로 문서를 한 번씩만 훑는다.
+    """
+
+    def __init__(self, index: SchemaIndex):
+        self.index = index
+        self.schema_items = index.items
+        # 빈 ID/제목은 `"" in doc`이 항상 참이므로 문서만 있으면 발견 처리
+        self._always: Set[int] = set()
+        self._ids = None
+        self._titles = None
+
+        if not AHOCORASICK_AVAILABLE:
+            return
+
+        id_words: Dict[str, List[int]] = {}
+        title_words: Dict[str, List[int]] = {}
+        for idx, (item_id, title) in enumerate(zip(index.ids_lower, index.titles)):
+            if not item_id or not title:
+                self._always.add(idx)
+                continue
+            id_words.setdefault(item_id, []).append(idx)
+            title_words.setdefault(title, []).append(idx)
+
+        self._ids = self._build(id_words)
+        self._titles = self._build(title_words)
+
+    @staticmethod
+    def _build(words: Dict[str, List[int]]):
+        automaton = ahocorasick.Automaton()
+        for word, indices in words.items():
+            automaton.add_word(word, indices)
+        if words:
+            automaton.make_automaton()
+        return automaton
+
+    def found_indices(self, document_content: str) -> Set[int]:
+        """문서에서 발견된 항목 인덱스 집합"""
+        if self._ids is None:
+            doc_lower = document_content.lower() if document_content else ""
+            doc_raw = document_content
+            return {
+                idx for idx, (item_id, title) in enumerate(zip(self.index.ids_lower, self.index.titles))
+                if item_id in doc_lower or title in doc_raw
+            }
+
+        found = set(self._always)
+        for automaton, text in ((self._ids, document_content.lower()), (self._titles, document_content)):
+            if len(automaton):
+                for _end, indices in automaton.iter(text):
+                    found.update(indices)
+        return found
+
+
+@lru_cache(maxsize=8)
+def _load_ich_schema_cached(path_str: str, mtime: float) -> Tuple[Dict[str, Any], SchemaIndex, _ItemMatcher]:
+    """스키마 파싱 + 항목 인덱스 + 매처 구성 결과 캐시 (파일 수정 시각이 바뀌면 다시 로드)"""
+    with open(path_str, 'r', encoding='utf-8') as f:
+        schema_data = yaml.load(f, Loader=_YAML_LOADER) or {"schema": {}}
+    index = _build_schema_index(_extract_schema_items(schema_data))
+    return schema_data, index, _ItemMatcher(index)
+
+
+def _load_ich_schema() -> Tuple[Dict[str, Any], SchemaIndex, _ItemMatcher]:
+    """ICH M1/M2 스키마 로드 (스키마 데이터, 검증 항목 인덱스, 항목 매처)"""
     # CTDMate 프로젝트의 data 폴더에서 스키마 로드
     script_dir = Path(__file__).resolve().parent.parent
     schema_paths = [
@@ -17,14 +127,17 @@ def _load_ich_schema() -> Dict[str, Any]:
     ]
 
     for schema_path in schema_paths:
-        if schema_path.exists():
-            try:
-                with open(schema_path, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f)
-            except Exception as e:
-                print(f"Warning: Failed to load schema from {schema_path}: {e}")
+        try:
+            mtime = schema_path.stat().st_mtime
+        except OSError:
+            continue
+        try:
+            return _load_ich_schema_cached(str(schema_path), mtime)
+        except Exception as e:
+            print(f"Warning: Failed to load schema from {schema_path}: {e}")
 
-    return {"schema": {}}
+    empty = _build_schema_index([])
+    return {"schema": {}}, empty, _ItemMatcher(empty)
 
 
 def _extract_schema_items(schema_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -53,42 +166,57 @@ def _extract_schema_items(schema_data: Dict[str, Any]) -> List[Dict[str, Any]]:
 
 
 def _extract_sections_recursive(sections: Any, parent_key: str, items: List[Dict[str, Any]]):
-    """재귀적으로 섹션 추출"""
-    if isinstance(sections, dict):
-        for key, value in sections.items():
-            if isinstance(value, dict):
-                # 제목이 있는 항목
-                if "title" in value:
-                    section_id = f"{parent_key}.{key}" if not key.startswith(parent_key) else key
-                    items.append({
-                        "id": section_id,
-                        "module": parent_key,
-                        "title": value.get("title", ""),
-                        "description": value.get("description", "")
-                    })
-                # 하위 섹션 재귀 탐색
-                _extract_sections_recursive(value, f"{parent_key}.{key}", items)
-
-
-def _check_missing_items(schema_items: List[Dict[str, Any]], document_content: str = "") -> Dict[str, Any]:
+    """섹션 트리를 전위 순회하며 섹션 추출 (명시적 스택 사용, 재귀 깊이 제한 없음)"""
+    if not isinstance(sections, dict):
+        return
+
+    append = items.append
+    # (키, 값, 부모 키) — 역순으로 쌓아 기존 재귀와 같은 순서로 꺼냄
+    stack = deque((key, value, parent_key) for key, value in reversed(sections.items()))
+    while stack:
+        key, value, pkey = stack.pop()
+        if not isinstance(value, dict):
+            continue
+
+        child_key = f"{pkey}.{key}"
+        # 제목이 있는 항목
+        if "title" in value:
+            append({
+                "id": key if key.startswith(pkey) else child_key,
+                "module": pkey,
+                "title": value.get("title", ""),
+                "description": value.get("description", "")
+            })
+        # 하위 섹션
+        stack.extend((k, v, child_key) for k, v in reversed(value.items()))
+
+
+def _check_missing_items(schema_items: List[Dict[str, Any]], document_content: str = "",
+                         matcher: Optional[_ItemMatcher] = None) -> Dict[str, Any]:
     """문서에서 누락된 항목 확인"""
+    # 문서 내용이 없으면 모두 누락으로 처리 (캐시된 목록은 복사해서 반환)
+    if not document_content:
+        return {
+            "total_required": len(schema_items),
+            "found": 0,
+            "missing": len(schema_items),
+            "missing_items": schema_items[:],
+            "found_items": []
+        }
+
     missing_items = []
     found_items = []
 
-    for item in schema_items:
-        item_id = item.get("id", "")
-        title = item.get("title", "")
+    # 간단한 키워드 매칭 (실제로는 더 정교한 파싱 필요)
+    # ID나 제목이 문서에 있는지 확인 (모든 항목을 한 번에 매칭)
+    if matcher is None or matcher.schema_items is not schema_items:
+        matcher = _ItemMatcher(_build_schema_index(schema_items))
+    found = matcher.found_indices(document_content)
 
-        # 간단한 키워드 매칭 (실제로는 더 정교한 파싱 필요)
-        # 문서 내용이 있으면 검색, 없으면 모두 누락으로 처리
-        if document_content:
-            # ID나 제목이 문서에 있는지 확인
-            if item_id.lower() in document_content.lower() or title in document_content:
-                found_items.append(item)
-            else:
-                missing_items.append(item)
+    for idx, item in enumerate(schema_items):
+        if idx in found:
+            found_items.append(item)
         else:
-            # 문서 내용이 없으면 모두 누락
             missing_items.append(item)
 
     return {
@@ -131,8 +259,9 @@ def generate_validation_report(
         output_path = Path(output_dir)
         output_path.mkdir(exist_ok=True, parents=True)
 
-        # 타임스탬프
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # 타임스탬프 (파일명/본문에 같은 시각 사용)
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
 
         # 파일명
         if output_format == "markdown":
@@ -143,13 +272,12 @@ def generate_validation_report(
         report_path = output_path / report_filename
 
         # ICH 스키마 로드 및 검증
-        schema_data = _load_ich_schema()
-        schema_items = _extract_schema_items(schema_data)
-        missing_check = _check_missing_items(schema_items, document_content)
+        _schema_data, schema_index, matcher = _load_ich_schema()
+        missing_check = _check_missing_items(schema_index.items, document_content, matcher)
 
         # 기본 리포트 구조
         report_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "summary": {
                 "total": missing_check["total_required"],
                 "passed": missing_check["found"],
@@ -161,25 +289,30 @@ def generate_validation_report(
         }
 
         # 검증 YAML 파일이 있으면 읽기
-        validation_files = list(output_path.glob("*_validation.yaml"))
+        with os.scandir(output_path) as it:
+            validation_files = [
+                (entry.name, entry.path) for entry in it
+                if entry.name.endswith("_validation.yaml") and entry.is_file()
+            ]
         if validation_files:
-            import yaml
-            for vf in validation_files:
+            summary = report_data["summary"]
+            report_items_append = report_data["items"].append
+            for vf_name, vf in validation_files:
                 try:
                     with open(vf, 'r', encoding='utf-8') as f:
-                        data = yaml.safe_load(f)
+                        data = yaml.load(f, Loader=_YAML_LOADER)
                         if isinstance(data, dict):
                             # 검증 결과 추출
                             if "validation" in data:
                                 validation = data["validation"]
-                                report_data["summary"]["total"] += 1
+                                summary["total"] += 1
                                 if validation.get("pass", False):
-                                    report_data["summary"]["passed"] += 1
+                                    summary["passed"] += 1
                                 else:
-                                    report_data["summary"]["failed"] += 1
+                                    summary["failed"] += 1
 
-                                report_data["items"].append({
-                                    "file": vf.name,
+                                report_items_append({
+                                    "file": vf_name,
                                     "status": "passed" if validation.get("pass") else "failed",
                                     "issues": validation.get("issues", [])
                                 })
@@ -189,11 +322,10 @@ def generate_validation_report(
         # 리포트 작성
         if output_format == "markdown":
             content = _generate_markdown_report(report_data)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(content)
         else:
-            content = json.dumps(report_data, ensure_ascii=False, indent=2)
-
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            report_path.write_bytes(_dumps_report(report_data))
 
         return {
             "ok": True,
@@ -212,7 +344,15 @@ def generate_validation_report(
 
 def _generate_markdown_report(data: Dict[str, Any]) -> str:
     """마크다운 리포트 생성 (ICH 스키마 기반 누락 항목 포함)"""
-    lines = [
+    buf = io.StringIO()
+    w = buf.write
+
+    def wln(*xs: str):
+        """각 문자열을 한 줄씩 기록"""
+        w("\n".join(xs))
+        w("\n")
+
+    wln(
         "# CTD Validation Report",
         "",
         f"**Generated:** {data['timestamp']}",
@@ -224,102 +364,97 @@ def _generate_markdown_report(data: Dict[str, Any]) -> str:
         f"- **Missing:** ❌ {data['summary']['failed']}",
         f"- **Warnings:** ⚠️ {data['summary']['warnings']}",
         "",
-    ]
+    )
 
     # ICH 스키마 기반 누락 항목
     if "schema_check" in data:
         schema_check = data["schema_check"]
-        lines.extend([
+        wln(
             "## ICH M1/M2 Schema Compliance",
             "",
             f"**Completeness:** {schema_check['found']}/{schema_check['total_required']} items found",
             ""
-        ])
+        )
 
         # 누락된 항목 표시
         if schema_check.get("missing_items"):
-            lines.extend([
+            wln(
                 "### ❌ Missing Required Items",
                 ""
-            ])
+            )
 
             # 모듈별로 그룹화
-            missing_by_module = {}
+            missing_by_module = defaultdict(list)
             for item in schema_check["missing_items"]:
-                module = item.get("module", "Unknown")
-                if module not in missing_by_module:
-                    missing_by_module[module] = []
-                missing_by_module[module].append(item)
+                missing_by_module[item.get("module", "Unknown")].append(item)
 
             for module, items in sorted(missing_by_module.items()):
-                lines.append(f"#### {module}")
-                lines.append("")
+                wln(f"#### {module}", "")
                 for item in items:
                     item_id = item.get("id", "")
                     title = item.get("title", "No title")
                     description = item.get("description", "")
-                    lines.append(f"- **{item_id}**: {title}")
+                    w(f"- **{item_id}**: {title}\n")
                     if description:
                         # 설명의 첫 100자만 표시
                         desc_preview = description[:100] + "..." if len(description) > 100 else description
-                        lines.append(f"  - {desc_preview}")
-                lines.append("")
+                        w(f"  - {desc_preview}\n")
+                w("\n")
 
         # 발견된 항목 표시
         if schema_check.get("found_items"):
-            lines.extend([
+            wln(
                 "### ✅ Found Items",
                 ""
-            ])
+            )
 
             # 모듈별로 그룹화
-            found_by_module = {}
+            found_by_module = defaultdict(list)
             for item in schema_check["found_items"]:
-                module = item.get("module", "Unknown")
-                if module not in found_by_module:
-                    found_by_module[module] = []
-                found_by_module[module].append(item)
+                found_by_module[item.get("module", "Unknown")].append(item)
 
             for module, items in sorted(found_by_module.items()):
-                lines.append(f"#### {module}")
-                lines.append("")
+                wln(f"#### {module}", "")
                 for item in items:
                     item_id = item.get("id", "")
                     title = item.get("title", "No title")
-                    lines.append(f"- **{item_id}**: {title}")
-                lines.append("")
+                    w(f"- **{item_id}**: {title}\n")
+                w("\n")
 
     # 기존 검증 결과
     if data.get("items"):
-        lines.extend([
+        wln(
             "## Validation Results",
             ""
-        ])
+        )
 
         for i, item in enumerate(data["items"], 1):
             status_icon = "✅" if item["status"] == "passed" else "❌"
-            lines.append(f"### {i}. {item['file']} {status_icon}")
-            lines.append("")
-            lines.append(f"**Status:** {item['status'].upper()}")
+            wln(
+                f"### {i}. {item['file']} {status_icon}",
+                "",
+                f"**Status:** {item['status'].upper()}"
+            )
 
             if item.get("issues"):
-                lines.append("")
-                lines.append("**Issues:**")
+                wln("", "**Issues:**")
                 for issue in item["issues"]:
-                    lines.append(f"- {issue}")
+                    w(f"- {issue}\n")
             else:
-                lines.append("")
-                lines.append("*No issues found.*")
+                wln("", "*No issues found.*")
 
-            lines.append("")
+            w("\n")
 
-    lines.append("---")
-    lines.append("")
-    lines.append("*Report generated by CTDAgent validation system*")
-    lines.append("")
-    lines.append("**Note:** This report is based on ICH M1/M2 schema compliance checking.")
+    wln(
+        "---",
+        "",
+        "*Report generated by CTDAgent validation system*",
+        ""
+    )
+    # 마지막 줄은 줄바꿈 없이 끝냄 (기존 "\n".join 결과와 동일)
+    w("**Note:** This report is based on ICH M1/M2 schema compliance checking.")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 if __name__ == "__main__":
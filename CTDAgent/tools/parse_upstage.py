@@ -1,7 +1,11 @@
 """Upstage Document Parse 도구 (ctdmate 통합)"""
+import os
 import sys
+import pickle
+import hashlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 # ctdmate 모듈 임포트를 위한 경로 추가
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
@@ -14,6 +18,58 @@ except Exception as e:
     print(f"Warning: Upstage parser not available: {e}")
     UPSTAGE_AVAILABLE = False
 
+# 파싱 결과 디스크 캐시 (프로세스 간 공유)
+PARSE_CACHE_DIR = Path(os.getenv("PARSE_CACHE_DIR", "./data/parse_cache"))
+
+
+@lru_cache(maxsize=64)
+def _parse_file_cached(abs_path: str, mtime: float, size: int) -> bytes:
+    """
+    단일 파일 파싱 (메모리 LRU + 디스크 pickle 캐시)
+
+    (경로, 수정시각, 크기)가 같으면 Upstage를 다시 호출하지 않는다.
+    결과는 pickle 바이트로 캐시해 호출자가 받은 리스트를 수정해도 캐시가 바뀌지 않게 한다.
+    실패는 예외로 올려 캐시에 남지 않게 한다.
+    """
+    digest = hashlib.sha1(repr((abs_path, mtime, size)).encode("utf-8")).hexdigest()
+    cache_file = PARSE_CACHE_DIR / f"{digest}.pkl"
+    if cache_file.exists():
+        try:
+            data = cache_file.read_bytes()
+            pickle.loads(data)  # 손상된 캐시 파일 확인
+            return data
+        except Exception as e:
+            print(f"Warning: Failed to read parse cache {cache_file}: {e}")
+
+    result = upstage_parse_run([abs_path])
+    if not result.get("ok"):
+        raise RuntimeError(result.get("errors") or "Upstage parse failed")
+
+    data = pickle.dumps(result.get("results", []))
+    try:
+        PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(data)
+    except Exception as e:
+        print(f"Warning: Failed to write parse cache {cache_file}: {e}")
+    return data
+
+
+def _parse_file(path: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """파일 하나를 캐시를 거쳐 파싱 (결과, 오류 메시지) 반환 (성공한 결과만 캐시됨, 결과는 호출마다 새 객체)"""
+    abs_path = os.path.abspath(path)
+    try:
+        mtime, size = os.path.getmtime(abs_path), os.path.getsize(abs_path)
+    except OSError:
+        # 파일이 없거나 stat 불가: 캐시 없이 그대로 위임
+        result = upstage_parse_run([path])
+        error = None if result.get("ok") else f"{path}: {result.get('errors') or 'Upstage parse failed'}"
+        return result.get("results", []), error
+    try:
+        return pickle.loads(_parse_file_cached(abs_path, mtime, size)), None
+    except RuntimeError as e:
+        print(f"Warning: Failed to parse {path}: {e}")
+        return [], f"{path}: {e}"
+
 
 def parse_documents(file_paths: Optional[List[str]] = None,
                    texts: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -42,12 +98,21 @@ def parse_documents(file_paths: Optional[List[str]] = None,
         }
 
     try:
-        result = upstage_parse_run(file_paths)
-        return {
-            "ok": True,
-            "results": result.get("results", []),
+        results: List[Dict[str, Any]] = []
+        errors: List[str] = []
+        for path in file_paths:
+            file_results, error = _parse_file(path)
+            results.extend(file_results)
+            if error:
+                errors.append(error)
+        out = {
+            "ok": not errors,
+            "results": results,
             "total_files": len(file_paths)
         }
+        if errors:
+            out["error"] = "; ".join(errors)
+        return out
     except Exception as e:
         return {
             "ok": False,
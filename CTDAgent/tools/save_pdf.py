@@ -1,16 +1,103 @@
 """PDF 저장 도구"""
+import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Set
+import io
+import logging
 import time
 import re
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 마크다운 줄 구분 접두사 (일반 문단은 한 번의 startswith로 판별)
+_MD_PREFIXES = ('# ', '## ', '### ', '---')
+
+# **굵게** 인라인 (한 줄의 여러 구간을 한 번에 변환)
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+
+# 전역 스타일시트 (읽기 전용으로만 사용하므로 PDF 간 공유)
+_STYLES = None
+
+
+def _get_styles():
+    """reportlab 기본 스타일시트 가져오기 (싱글톤)"""
+    global _STYLES
+    if _STYLES is None:
+        _STYLES = getSampleStyleSheet()
+    return _STYLES
+
+
+def _strip_yaml_fence(content: str) -> str:
+    """```yaml 코드 블록이면 첫/마지막 줄을 슬라이싱으로 제거 (줄 리스트를 만들지 않음)"""
+    if not content.lstrip().startswith('```yaml'):
+        return content
+    first_nl = content.find('\n')
+    last_nl = content.rfind('\n')
+    # 줄이 2개 이하면 그대로 둠
+    if first_nl == last_nl:
+        return content
+    return content[first_nl + 1:last_nl]
+
+
+def _list_present(output_path: Path) -> Set[str]:
+    """출력 디렉토리의 파일명 집합 (scandir 한 번으로 존재 여부 확인)"""
+    with os.scandir(output_path) as it:
+        return {entry.name for entry in it if entry.is_file()}
+
+
+def _read_contents(output_path: Path, filenames: Iterable[str],
+                   present: Optional[Set[str]] = None) -> Dict[str, str]:
+    """존재하는 YAML 파일 내용을 한 번만 읽어 파일명 → 내용으로 반환"""
+    if present is None:
+        present = _list_present(output_path)
+    contents = {}
+    for filename in dict.fromkeys(filenames):
+        if filename in present:
+            with open(output_path / filename, 'r', encoding='utf-8') as f:
+                contents[filename] = f.read()
+    return contents
+
+
+def _iter_lines(module_order: List[tuple], title: str, contents: Dict[str, str]) -> Iterator[str]:
+    """PDF에 들어갈 마크다운을 한 줄씩 생성 (contents: 미리 읽어 둔 파일명 → 내용, 없는 모듈은 생략)"""
+    yield f"# {title}"
+    yield ""
+    yield "---"
+    yield ""
+
+    for filename_pattern, section_title in module_order:
+        if filename_pattern not in contents:
+            continue
+
+        yield ""
+        yield ""
+        yield f"# {section_title}"
+        yield ""
+        yield "---"
+        yield ""
+        yield from _strip_yaml_fence(contents[filename_pattern]).split('\n')
+        yield ""
+
+    yield ""
+
 
 def _generate_single_pdf(output_path: Path, module_order: List[tuple],
-                        pdf_filename: str, title: str) -> Dict[str, Any]:
+                        pdf_filename: str, title: str,
+                        contents: Optional[Dict[str, str]] = None,
+                        present: Optional[Set[str]] = None) -> Dict[str, Any]:
     """
     단일 PDF 생성 (헬퍼 함수)
 
@@ -19,16 +106,13 @@ def _generate_single_pdf(output_path: Path, module_order: List[tuple],
         module_order: (파일명, 제목) 튜플 리스트
         pdf_filename: PDF 파일명
         title: PDF 문서 제목
+        contents: 미리 읽어 둔 파일명 → 내용 (없으면 출력 디렉토리에서 읽음)
+        present: 출력 디렉토리에 있는 파일명 집합 (contents가 없을 때만 사용)
 
     Returns:
         생성 결과 딕셔너리
     """
-    try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet
-        from reportlab.lib.units import inch
-    except ImportError:
+    if not REPORTLAB_AVAILABLE:
         return {
             "ok": False,
             "error": "reportlab not installed",
@@ -36,35 +120,15 @@ def _generate_single_pdf(output_path: Path, module_order: List[tuple],
         }
 
     pdf_path = output_path / pdf_filename
-
-    # 통합 마크다운 생성
-    markdown_parts = []
-    markdown_parts.append(f"# {title}\n\n")
-    markdown_parts.append("---\n\n")
-
-    for filename_pattern, section_title in module_order:
-        file_path = output_path / filename_pattern
-        if file_path.exists():
-            markdown_parts.append(f"\n\n# {section_title}\n\n")
-            markdown_parts.append("---\n\n")
-
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # ```yaml 코드 블록 제거
-            if content.strip().startswith('```yaml'):
-                lines = content.split('\n')
-                content = '\n'.join(lines[1:-1]) if len(lines) > 2 else content
-
-            markdown_parts.append(content)
-            markdown_parts.append("\n\n")
-
-    full_markdown = "".join(markdown_parts)
+    if contents is None:
+        contents = _read_contents(output_path, (name for name, _ in module_order), present)
 
     # PDF 생성
     try:
+        # 메모리에 빌드한 뒤 한 번에 기록
+        buf = io.BytesIO()
         doc = SimpleDocTemplate(
-            str(pdf_path),
+            buf,
             pagesize=A4,
             leftMargin=50,
             rightMargin=50,
@@ -72,48 +136,46 @@ def _generate_single_pdf(output_path: Path, module_order: List[tuple],
             bottomMargin=50
         )
 
-        styles = getSampleStyleSheet()
+        styles = _get_styles()
+        normal_s = styles['Normal']
+
+        # 헤딩 접두사 → (스타일, 뒤에 붙일 Spacer 높이)
+        heading_rules = {
+            '# ': (styles['Title'], 0.2*inch),
+            '## ': (styles['Heading1'], 0.1*inch),
+            '### ': (styles['Heading2'], None),
+        }
+
         story = []
+        append = story.append
 
-        lines = full_markdown.split('\n')
-        for line in lines:
+        for line in _iter_lines(module_order, title, contents):
             if not line.strip():
-                story.append(Spacer(1, 0.1*inch))
+                append(Spacer(1, 0.1*inch))
                 continue
 
-            if line.startswith('# '):
-                text = line.replace('# ', '')
-                para = Paragraph(f"<b>{text}</b>", styles['Title'])
-                story.append(para)
-                story.append(Spacer(1, 0.2*inch))
-            elif line.startswith('## '):
-                text = line.replace('## ', '')
-                para = Paragraph(f"<b>{text}</b>", styles['Heading1'])
-                story.append(para)
-                story.append(Spacer(1, 0.1*inch))
-            elif line.startswith('### '):
-                text = line.replace('### ', '')
-                para = Paragraph(f"<b>{text}</b>", styles['Heading2'])
-                story.append(para)
-            elif line.startswith('---'):
-                story.append(Spacer(1, 0.1*inch))
-            else:
-                text = line.replace('**', '<b>', 1)
-                if '<b>' in text:
-                    text = text.replace('**', '</b>', 1)
-
+            if not line.startswith(_MD_PREFIXES):
                 try:
-                    para = Paragraph(text, styles['Normal'])
-                    story.append(para)
+                    append(Paragraph(_BOLD_RE.sub(r'<b>\1</b>', line), normal_s))
                 except:
                     pass
+            elif line.startswith('---'):
+                append(Spacer(1, 0.1*inch))
+            else:
+                prefix = line[:line.find(' ') + 1]
+                style, spacer = heading_rules[prefix]
+                append(Paragraph(f"<b>{line[len(prefix):]}</b>", style))
+                if spacer is not None:
+                    append(Spacer(1, spacer))
 
         doc.build(story)
+        data = buf.getvalue()
+        pdf_path.write_bytes(data)
 
         return {
             "ok": True,
             "path": str(pdf_path),
-            "size": pdf_path.stat().st_size
+            "size": len(data)
         }
 
     except Exception as e:
@@ -160,40 +222,41 @@ def save_as_pdf(yaml_files: Optional[List[str]] = None,
         ("M2_7.yaml", "제2부 - 2.7 임상시험자료요약"),
     ]
 
-    # 1. 전체 통합 PDF 생성
-    print(f"\n{'='*80}")
-    print(f"📄 GENERATING COMPLETE PDF")
-    print(f"{'='*80}")
+    # 두 PDF가 같은 M2_*.yaml을 쓰므로 파일은 한 번만 읽어 공유
+    present = _list_present(output_path)
+    contents = _read_contents(output_path, (name for name, _ in full_module_order + module2_order), present)
+    module2_filename = "CTD_Module2_Complete2.pdf"
+
+    # 1. 전체 통합 PDF 생성 (레이아웃은 순수 Python이라 GIL 때문에 두 PDF를 스레드로 나눠도 이득 없음)
+    logger.info("Generating complete PDF + Module 2 PDF in %s", output_path)
     complete_result = _generate_single_pdf(
         output_path,
         full_module_order,
         filename,
-        "국제공통기술문서(CTD) - TM-5 용액"
+        "국제공통기술문서(CTD) - TM-5 용액",
+        contents,
+        present
     )
 
     if not complete_result["ok"]:
         return complete_result
 
-    print(f"✅ Complete PDF generated: {complete_result['path']}")
-    print(f"   Size: {complete_result['size']:,} bytes\n")
+    logger.info("Complete PDF generated: %s (%d bytes)", complete_result['path'], complete_result['size'])
 
     # 2. Module 2 전용 PDF 생성
-    print(f"{'='*80}")
-    print(f"📄 GENERATING MODULE 2 PDF")
-    print(f"{'='*80}")
-    module2_filename = "CTD_Module2_Complete2.pdf"
     module2_result = _generate_single_pdf(
         output_path,
         module2_order,
         module2_filename,
-        "국제공통기술문서(CTD) - 제2부 (Module 2)"
+        "국제공통기술문서(CTD) - 제2부 (Module 2)",
+        contents,
+        present
     )
 
     if module2_result["ok"]:
-        print(f"✅ Module 2 PDF generated: {module2_result['path']}")
-        print(f"   Size: {module2_result['size']:,} bytes\n")
+        logger.info("Module 2 PDF generated: %s (%d bytes)", module2_result['path'], module2_result['size'])
     else:
-        print(f"⚠️  Module 2 PDF generation failed: {module2_result.get('error', 'Unknown error')}\n")
+        logger.warning("Module 2 PDF generation failed: %s", module2_result.get('error', 'Unknown error'))
 
     # 결과 반환 (두 PDF 모두 포함)
     return {
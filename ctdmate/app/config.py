@@ -41,3 +41,9 @@ QDRANT_URL       = os.getenv("QDRANT_URL", "")  # 빈 문자열 = 로컬 path 
 QDRANT_API_KEY   = os.getenv("QDRANT_API_KEY", "")
 QDRANT_GUIDE_COLLECTION    = os.getenv("QDRANT_GUIDE_COLLECTION", "guidelines")
 QDRANT_GLOSSARY_COLLECTION = os.getenv("QDRANT_GLOSSARY_COLLECTION", "glossary")
+
+# ---------- Server ----------
+# 쉼표 구분 (예: "https://a.com,https://b.com"), 기본 "*"
+CORS_ORIGINS = [o.strip() for o in os.getenv("CTD_CORS_ORIGINS", "*").split(",") if o.strip()]
+# 워커마다 모델을 따로 올리고 로컬 Qdrant 저장소는 한 프로세스만 열 수 있으므로 기본 1 (Qdrant 서버 사용 시에만 늘릴 것)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
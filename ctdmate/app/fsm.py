@@ -11,12 +11,12 @@ except Exception:
 
 try:
     from ctdmate.brain.router import Router, LlamaLocalClient
-    from ctdmate.tools.smartdoc_upstage import run as parse_run
+    from ctdmate.tools.smartdoc_upstage import run_batch as parse_run
     from ctdmate.tools.reg_rag import RegulationRAGTool
     from ctdmate.tools.gen_solar import SolarGenerator
 except Exception:
     from ..brain.router import Router, LlamaLocalClient  # type: ignore
-    from ..tools.smartdoc_upstage import run as parse_run  # type: ignore
+    from ..tools.smartdoc_upstage import run_batch as parse_run  # type: ignore
     from ..tools.reg_rag import RegulationRAGTool  # type: ignore
     from ..tools.gen_solar import SolarGenerator  # type: ignore
 
@@ -1,14 +1,29 @@
 # ctdmate/app/router.py
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
+import asyncio
+import hashlib
+import io
+import logging
 import os
+import queue
+import re
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from uuid import uuid4
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+import httpx
+import orjson
+
+from fastapi import FastAPI, File, Request, Response, UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 # 내부 의존성
 try:
@@ -17,7 +32,7 @@ try:
     from ctdmate.brain.router import Router, LlamaLocalClient
     from ctdmate.tools.reg_rag import RegulationRAGTool
     from ctdmate.tools.gen_solar import SolarGenerator
-    from ctdmate.tools.smartdoc_upstage import run as parse_run
+    from ctdmate.tools.smartdoc_upstage import run_batch as parse_run
     from ctdmate.utils.pdf_generator import CTDPDFGenerator
 except Exception:
     from . import config as CFG  # type: ignore
@@ -25,10 +40,57 @@ except Exception:
     from ..brain.router import Router, LlamaLocalClient  # type: ignore
     from ..tools.reg_rag import RegulationRAGTool  # type: ignore
     from ..tools.gen_solar import SolarGenerator  # type: ignore
-    from ..tools.smartdoc_upstage import run as parse_run  # type: ignore
+    from ..tools.smartdoc_upstage import run_batch as parse_run  # type: ignore
     from ..utils.pdf_generator import CTDPDFGenerator  # type: ignore
 
-app = FastAPI(title="CTDMate API", version="0.1.0")
+# 로깅: 요청 경로에서는 큐에 넣기만 하고 stderr 출력은 리스너 스레드가 담당
+# 리스너는 startup에서 시작 (import/fork 시점에는 스레드를 만들지 않음)
+# 리스너가 도는 동안에는 상위 로거(root의 basicConfig 핸들러 등)로 전파하지 않아 중복 출력/동기 쓰기를 막음
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_handler = QueueHandler(_log_queue)
+_log_listener: Optional[QueueListener] = None
+_log_level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger("ctdmate")
+logger.setLevel(_log_level if isinstance(_log_level, int) else logging.INFO)  # 알 수 없는 값이면 INFO
+
+
+def _start_log_listener() -> None:
+    """큐의 로그 레코드를 출력하는 리스너 시작 후 큐 핸들러 연결 (이미 시작했으면 무시)"""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _log_listener = QueueListener(_log_queue, handler)
+    _log_listener.start()
+    logger.addHandler(_log_handler)
+    logger.propagate = False
+
+
+def _stop_log_listener() -> None:
+    """큐 핸들러를 떼고 남은 레코드를 모두 출력한 뒤 리스너 종료"""
+    global _log_listener
+    if _log_listener is None:
+        return
+    logger.removeHandler(_log_handler)
+    logger.propagate = True
+    _log_listener.stop()
+    _log_listener = None
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """워커 프로세스 시작/종료 시 로그 리스너와 공유 HTTP 클라이언트 관리"""
+    _start_log_listener()
+    try:
+        yield
+    finally:
+        _close_http()
+        _stop_log_listener()
+
+
+# 응답 JSON은 orjson으로 직렬화
+app = FastAPI(title="CTDMate API", version="0.1.0", default_response_class=ORJSONResponse, lifespan=_lifespan)
 
 # 정적 파일 및 업로드 디렉토리 설정
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -48,56 +110,395 @@ if CTDAGENT_PATH.exists():
     try:
         from agent import run_agent as run_ctd_agent
         CTDAGENT_AVAILABLE = True
-        print(f"✓ CTDAgent loaded from {CTDAGENT_PATH}")
+        logger.info("CTDAgent loaded from %s", CTDAGENT_PATH)
     except Exception as e:
-        print(f"Warning: CTDAgent import failed: {e}")
+        logger.warning("CTDAgent import failed: %s", e)
         CTDAGENT_AVAILABLE = False
         run_ctd_agent = None
 else:
     CTDAGENT_AVAILABLE = False
     run_ctd_agent = None
-    print(f"Warning: CTDAgent not found at {CTDAGENT_PATH}")
+    logger.warning("CTDAgent not found at %s", CTDAGENT_PATH)
 
 # 정적 파일 서빙
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
-# 단일 인스턴스(간단)
-_llama = LlamaLocalClient()  # 구현체로 교체
-_router = Router(llama=_llama)
-_fsm = CTDFSM(llama_client=_llama)
-_reg = RegulationRAGTool(auto_normalize=True, enable_rag=True, llama_client=_llama)
-_gen = SolarGenerator(enable_rag=True, auto_normalize=True, output_format="yaml")
-_pdf_gen = CTDPDFGenerator(output_dir=str(OUTPUT_DIR))
+# 단일 인스턴스 (첫 사용 시 생성: import만으로 모델 로드/Qdrant 연결을 하지 않도록)
+_llama: Optional[LlamaLocalClient] = None
+_router: Optional[Router] = None
+_fsm: Optional[CTDFSM] = None
+_reg: Optional[RegulationRAGTool] = None
+_gen: Optional[SolarGenerator] = None
+_pdf_gen: Optional[CTDPDFGenerator] = None
+_http: Optional[httpx.Client] = None  # 외부 API 공유 커넥션 풀 (프로세스별, 첫 요청 때 생성)
+_http_pid = 0  # _http를 만든 프로세스 (fork로 물려받은 클라이언트는 쓰지 않음)
+_init_lock = threading.RLock()
+
+
+def _get_llama() -> LlamaLocalClient:
+    global _llama
+    if _llama is None:
+        with _init_lock:
+            if _llama is None:
+                _llama = LlamaLocalClient()  # 구현체로 교체
+    return _llama
+
+
+def _get_router() -> Router:
+    global _router
+    if _router is None:
+        with _init_lock:
+            if _router is None:
+                _router = Router(llama=_get_llama())
+    return _router
+
+
+def _get_fsm() -> CTDFSM:
+    global _fsm
+    if _fsm is None:
+        with _init_lock:
+            if _fsm is None:
+                _fsm = CTDFSM(llama_client=_get_llama())
+                _fsm.gen.set_http(_HTTP)
+    return _fsm
+
+
+def _get_reg() -> RegulationRAGTool:
+    global _reg
+    if _reg is None:
+        with _init_lock:
+            if _reg is None:
+                _reg = RegulationRAGTool(auto_normalize=True, enable_rag=True, llama_client=_get_llama())
+    return _reg
+
+
+def _get_gen() -> SolarGenerator:
+    global _gen
+    if _gen is None:
+        with _init_lock:
+            if _gen is None:
+                _gen = SolarGenerator(enable_rag=True, auto_normalize=True, output_format="yaml")
+                _gen.set_http(_HTTP)
+    return _gen
+
+
+def _get_pdf_gen() -> CTDPDFGenerator:
+    global _pdf_gen
+    if _pdf_gen is None:
+        with _init_lock:
+            if _pdf_gen is None:
+                _pdf_gen = CTDPDFGenerator(output_dir=str(OUTPUT_DIR))
+    return _pdf_gen
+
+
+def warmup() -> None:
+    """무거운 싱글톤을 미리 생성 (gunicorn post_fork 등 워커 시작 시 호출)"""
+    for getter in (_get_llama, _get_router, _get_fsm, _get_reg, _get_gen, _get_pdf_gen):
+        getter()
+
+
+# ---------- 공유 HTTP 클라이언트 ----------
+def _get_http() -> httpx.Client:
+    """현재 프로세스의 공유 HTTP 클라이언트 (fork 후 자식 프로세스에서는 새로 생성)"""
+    global _http, _http_pid
+    pid = os.getpid()
+    if _http is None or _http_pid != pid:
+        with _init_lock:
+            if _http is None or _http_pid != pid:
+                # 도구 호출은 워커 스레드에서 동기로 실행되므로 동기 클라이언트를 공유
+                _http = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                    timeout=30,
+                )
+                _http_pid = pid
+    return _http
+
+
+def _close_http() -> None:
+    """이 프로세스가 만든 클라이언트만 닫기 (부모에게 물려받은 연결은 건드리지 않음)"""
+    global _http
+    if _http is not None and _http_pid == os.getpid():
+        _http.close()
+    _http = None
+
+
+class _ProcessHTTP:
+    """생성기에 연결하는 HTTP 핸들: 호출 시점 프로세스의 클라이언트로 위임"""
+
+    def post(self, *args: Any, **kwargs: Any) -> httpx.Response:
+        return _get_http().post(*args, **kwargs)
+
+
+_HTTP = _ProcessHTTP()
+
+
+# ---------- 업로드 저장 ----------
+_ALLOWED_EXT = frozenset({".pdf", ".xlsx", ".csv", ".xls"})
+_COPY_CHUNK = 1 << 20  # 1 MiB
+
+
+def _write_all(fd: int, data: memoryview) -> None:
+    """부분 쓰기를 고려해 data 전체를 fd에 기록"""
+    while data:
+        written = os.write(fd, data)
+        data = data[written:]
+
+
+def _fast_save(upload: UploadFile, dst: Path) -> int:
+    """
+    업로드 파일을 dst에 저장하고 기록한 바이트 수 반환
+
+    디스크에 있는 파일이면 os.sendfile로 커널 내 복사, 메모리에 있는 업로드(SpooledTemporaryFile 롤오버 전)나
+    sendfile이 안 되면 1 MiB 버퍼 readinto 복사.
+    """
+    src = upload.file
+    out_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        start = src.tell()
+        # 메모리에 있는 SpooledTemporaryFile/BytesIO는 name이 None
+        # (fileno()는 메모리 파일을 디스크로 롤오버하므로 디스크 파일일 때만 호출)
+        on_disk = getattr(src, "name", None) is not None
+        if on_disk:
+            try:
+                src.flush()
+                src_fd = src.fileno()
+                offset = start
+                while True:
+                    sent = os.sendfile(out_fd, src_fd, offset, _COPY_CHUNK)
+                    if sent == 0:
+                        break
+                    offset += sent
+                src.seek(offset)
+                return offset - start
+            except (OSError, AttributeError, io.UnsupportedOperation):
+                # sendfile 미지원: 처음부터 다시 복사
+                src.seek(start)
+                os.ftruncate(out_fd, 0)
+                os.lseek(out_fd, 0, os.SEEK_SET)
+
+        total = 0
+        buf = bytearray(_COPY_CHUNK)
+        mv = memoryview(buf)
+        readinto = getattr(src, "readinto", None)
+        while True:
+            if readinto is not None:
+                n = readinto(mv)
+            else:
+                chunk = src.read(_COPY_CHUNK)
+                n = len(chunk)
+                mv[:n] = chunk
+            if not n:
+                break
+            _write_all(out_fd, mv[:n])
+            total += n
+        return total
+    finally:
+        os.close(out_fd)
+
+
+def _latest_pdf(directory: Path) -> Optional[str]:
+    """디렉토리에서 가장 최근에 수정된 PDF 경로 (없으면 None, scandir 한 번으로 탐색)"""
+    try:
+        with os.scandir(directory) as it:
+            best = max(
+                (e for e in it if e.name.endswith(".pdf") and e.is_file()),
+                key=lambda e: e.stat().st_mtime,
+                default=None,
+            )
+    except FileNotFoundError:
+        return None
+    return best.path if best else None
+
+
+def _find_output(filename: str, cache_key: Optional[str] = None) -> Optional[Tuple[Path, os.stat_result]]:
+    """
+    CTDMate output → CTDAgent output 순으로 파일 찾기 (경로와 stat 결과 반환)
+
+    cache_key가 주어지면 해당 캐시 항목 디렉토리에서만 찾는다.
+    """
+    if cache_key is not None:
+        if not _HEX_KEY_RE.fullmatch(cache_key):
+            return None
+        directories: Tuple[Path, ...] = (_AGENT_CACHE_DIR / cache_key,)
+    else:
+        directories = (OUTPUT_DIR, CTDAGENT_OUTPUT_DIR)
+    for directory in directories:
+        file_path = directory / filename
+        try:
+            return file_path, os.stat(file_path)
+        except OSError:
+            continue
+    return None
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더(쉼표 구분 목록, W/ 약한 비교, *)에 etag가 있는지"""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def _file_response(request: Request, found: Tuple[Path, os.stat_result], media_type: str, **kwargs: Any) -> Response:
+    """ETag를 붙인 FileResponse (같은 이름으로 다시 생성될 수 있으므로 매번 재검증, If-None-Match가 맞으면 304)"""
+    file_path, st = found
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    headers = {"Cache-Control": "no-cache", "ETag": etag}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    headers.update(kwargs.pop("headers", None) or {})
+    # stat_result를 넘겨 FileResponse가 다시 stat하지 않도록
+    return FileResponse(path=str(file_path), media_type=media_type, stat_result=st, headers=headers, **kwargs)
+
+
+# ---------- CTDAgent 결과 캐시 ----------
+# 같은 파일(이름+내용)을 다시 올리면 파이프라인/에이전트를 건너뛰고 저장된 응답을 반환
+# 산출물은 캐시 항목 디렉토리에서 바로 서빙 (?cache=<key>), 항목 수는 CTD_AGENT_CACHE_MAX로 제한 (LRU)
+_AGENT_CACHE_DIR = OUTPUT_DIR / ".agent_cache"
+_AGENT_CACHE_MAX = int(os.getenv("CTD_AGENT_CACHE_MAX", "64"))
+_HEX_KEY_RE = re.compile(r"[0-9a-f]{32}")  # 캐시 키/작업 ID 형식 (경로 조작 방지)
+
+
+def _hash_files(paths: List[str]) -> str:
+    """업로드 파일들의 이름+내용 해시 (파일명 순, 1 MiB 단위 스트리밍)"""
+    h = hashlib.blake2b(digest_size=16)
+    mv = memoryview(bytearray(_COPY_CHUNK))
+    for path in sorted(paths, key=lambda p: Path(p).name):
+        # 모드 판별이 파일명에도 의존하므로 이름도 키에 포함
+        h.update(Path(path).name.encode("utf-8"))
+        with open(path, "rb") as f:
+            h.update(os.fstat(f.fileno()).st_size.to_bytes(8, "little"))
+            while n := f.readinto(mv):
+                h.update(mv[:n])
+    return h.hexdigest()
+
+
+def _artifact_infos(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """응답에서 산출물(PDF/리포트)을 가리키는 dict 목록 (경로 키는 path 또는 report_path)"""
+    infos = [response[key] for key in ("pdf", "module2_pdf") if (response.get(key) or {}).get("path")]
+    if (response.get("validation") or {}).get("report_path"):
+        infos.append(response["validation"])
+    return infos
+
+
+def _to_cache_entry(key: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """산출물 경로/URL을 캐시 항목 디렉토리 기준으로 바꾼 응답 사본"""
+    entry = _AGENT_CACHE_DIR / key
+    cached = dict(response)
+    for name in ("pdf", "module2_pdf", "validation"):
+        if isinstance(cached.get(name), dict):
+            cached[name] = dict(cached[name])
+    for info in _artifact_infos(cached):
+        path_key = "path" if "path" in info else "report_path"
+        filename = Path(info[path_key]).name
+        info[path_key] = str(entry / filename)
+        for url_key in ("download_url", "preview_url"):
+            if info.get(url_key):
+                info[url_key] = f"{info[url_key].split('?', 1)[0]}?cache={key}"
+    return cached
+
+
+def _load_cached_response(key: str) -> Optional[Dict[str, Any]]:
+    """캐시된 응답 읽기 (산출물이 빠졌거나 손상되면 None, 읽을 때마다 LRU 시각 갱신)"""
+    result_file = _AGENT_CACHE_DIR / key / "result.json"
+    try:
+        response = orjson.loads(result_file.read_bytes())
+        for info in _artifact_infos(response):
+            os.stat(info.get("path") or info["report_path"])
+        os.utime(result_file)
+    except (OSError, ValueError, KeyError):
+        return None
+    return response
+
+
+def _prune_agent_cache() -> None:
+    """최근 사용 순으로 _AGENT_CACHE_MAX개만 남기고 오래된 캐시 항목 삭제"""
+    entries = []
+    try:
+        with os.scandir(_AGENT_CACHE_DIR) as it:
+            for e in it:
+                if not e.is_dir():
+                    continue
+                try:
+                    mtime = os.stat(os.path.join(e.path, "result.json")).st_mtime_ns
+                except OSError:
+                    mtime = 0  # 기록 중이거나 깨진 항목은 가장 오래된 것으로 취급
+                entries.append((mtime, e.path))
+    except FileNotFoundError:
+        return
+    entries.sort(reverse=True)
+    for _, path in entries[_AGENT_CACHE_MAX:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _store_cached_response(key: str, response: Dict[str, Any]) -> None:
+    """응답과 산출물 사본을 캐시에 저장 (result.json은 마지막에 기록)"""
+    entry = _AGENT_CACHE_DIR / key
+    try:
+        entry.mkdir(parents=True, exist_ok=True)
+        for info in _artifact_infos(response):
+            path = info.get("path") or info["report_path"]
+            shutil.copyfile(path, entry / Path(path).name)
+        (entry / "result.json").write_bytes(
+            orjson.dumps(_to_cache_entry(key, response), option=_JSON_OPTS, default=str)
+        )
+    except (OSError, TypeError) as e:
+        logger.warning("Failed to cache agent result: %s", e)
+        return
+    _prune_agent_cache()
+
+
+# ---------- 응답 직렬화 ----------
+_JSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _json_response(data: Any) -> Response:
+    """큰 결과 dict를 orjson으로 한 번에 직렬화 (jsonable_encoder 순회 생략, Path/datetime은 str)"""
+    return Response(content=orjson.dumps(data, default=str, option=_JSON_OPTS), media_type="application/json")
 
 
 # ---------- Pydantic 모델 ----------
-class RouteReq(BaseModel):
+OutputFormat = Literal["yaml", "markdown"]
+
+
+class _Req(BaseModel):
+    # 알 수 없는 필드는 무시
+    model_config = ConfigDict(extra="ignore")
+
+
+class RouteReq(_Req):
     desc: str = Field(..., description="요청 설명")
 
 
-class ParseReq(BaseModel):
+class ParseReq(_Req):
     files: List[str] = Field(..., description="파싱 대상 경로(.pdf/.xlsx)")
 
 
-class ValidateReq(BaseModel):
+class ValidateReq(_Req):
     section: Optional[str] = Field(None, description="예: M2.3, M2.6, M2.7")
     content: Optional[str] = Field(None, description="검증 텍스트")
     excel_path: Optional[str] = Field(None, description="엑셀 파일 경로. 제공 시 시트별 검증")
     auto_fix: bool = True
 
 
-class GenerateReq(BaseModel):
+class GenerateReq(_Req):
     section: str = Field(..., description="예: M2.3, M2.6, M2.7")
     prompt: str = Field(..., description="생성 프롬프트")
-    format: str = Field("yaml", pattern="^(yaml|markdown)$")
+    format: OutputFormat = "yaml"
     csv_present: Optional[Any] = None
 
 
-class PipelineReq(BaseModel):
+class PipelineReq(_Req):
     desc: str = Field(..., description="요청 설명 또는 프롬프트")
     files: Optional[List[str]] = None
     section: Optional[str] = None
-    format: Optional[str] = Field(None, pattern="^(yaml|markdown)$")
+    format: Optional[OutputFormat] = None
     auto_fix: bool = True
 
 
@@ -116,37 +517,38 @@ def health() -> Dict[str, Any]:
 
 @app.post("/v1/route")
 def route(req: RouteReq) -> Dict[str, Any]:
-    return _router.decide(req.desc)
+    return _get_router().decide(req.desc)
 
 
 @app.post("/v1/parse")
-def parse(req: ParseReq) -> Dict[str, Any]:
-    return parse_run(req.files)
+async def parse(req: ParseReq) -> Dict[str, Any]:
+    # 파일별 파싱은 run_batch의 제한된 스레드 풀에서 동시에 실행 (이벤트 루프는 막지 않음)
+    return await asyncio.to_thread(parse_run, req.files)
 
 
-@app.post("/v1/validate")
-def validate(req: ValidateReq) -> Dict[str, Any]:
+@app.post("/v1/validate", response_model=None)
+def validate(req: ValidateReq) -> Response:
     if req.excel_path:
-        return _reg.validate_excel(req.excel_path, auto_fix=req.auto_fix)
+        return _json_response(_get_reg().validate_excel(req.excel_path, auto_fix=req.auto_fix))
     section = req.section or "M2.3"
     content = req.content or ""
-    return _reg.validate_and_normalize(section=section, content=content, auto_fix=req.auto_fix)
+    return _json_response(_get_reg().validate_and_normalize(section=section, content=content, auto_fix=req.auto_fix))
 
 
 @app.post("/v1/generate")
 def generate(req: GenerateReq) -> Dict[str, Any]:
-    return _gen.generate(section=req.section, prompt=req.prompt, output_format=req.format, csv_present=req.csv_present)
+    return _get_gen().generate(section=req.section, prompt=req.prompt, output_format=req.format, csv_present=req.csv_present)
 
 
-@app.post("/v1/pipeline")
-def pipeline(req: PipelineReq) -> Dict[str, Any]:
-    return _fsm.run(
+@app.post("/v1/pipeline", response_model=None)
+def pipeline(req: PipelineReq) -> Response:
+    return _json_response(_get_fsm().run(
         desc=req.desc,
         files=req.files or [],
         section=req.section,
         output_format=req.format,
         auto_fix=req.auto_fix,
-    )
+    ))
 
 
 @app.post("/v1/upload")
@@ -156,19 +558,18 @@ async def upload_files(files: List[UploadFile] = File(...)) -> Dict[str, Any]:
     try:
         for file in files:
             # 파일 확장자 확인
-            ext = Path(file.filename).suffix.lower()
-            if ext not in ['.pdf', '.xlsx', '.csv', '.xls']:
+            ext = os.path.splitext(file.filename)[1].lower()
+            if ext not in _ALLOWED_EXT:
                 raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}")
 
             # 파일 저장
             file_path = UPLOAD_DIR / file.filename
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            size = await run_in_threadpool(_fast_save, file, file_path)
 
             uploaded_files.append({
                 "filename": file.filename,
                 "path": str(file_path),
-                "size": file_path.stat().st_size
+                "size": size
             })
 
         return {
@@ -180,164 +581,267 @@ async def upload_files(files: List[UploadFile] = File(...)) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/v1/generate-ctd")
+# ---------- 백그라운드 작업 ----------
+# 파이프라인+에이전트(수 분 소요)는 프로세스 내 스레드 풀에서 실행하고 HTTP 요청은 즉시 반환
+# (이미 로드한 모델/Qdrant 싱글톤을 그대로 사용, 기본 1개씩 순서대로 실행)
+# 작업 상태는 OUTPUT_DIR/.jobs/<job_id>.json에 기록하므로 같은 호스트의 어느 워커 프로세스에서든 조회 가능
+_JOBS_DIR = OUTPUT_DIR / ".jobs"
+_JOB_WORKERS = int(os.getenv("CTD_JOB_WORKERS", "1"))
+_MAX_JOBS = 256  # 보관할 작업 기록 수 (초과 시 오래된 기록부터 삭제)
+_EXEC: Optional[ThreadPoolExecutor] = None
+
+
+def _run_pipeline(file_paths: List[str], uploaded_files: List[Dict[str, Any]], cache_key: str) -> Dict[str, Any]:
+    """CTDMate 파이프라인 + CTDAgent 실행 후 응답 구성 (작업 스레드에서 실행)"""
+    # CTDMate 파이프라인 실행 (검증 및 분석)
+    result = _get_fsm().run(
+        desc="Generate CTD 2.3.P.1 documents from uploaded composition files",
+        files=file_paths,
+        section="M2.3.P.1",
+        output_format="yaml",
+        auto_fix=True,
+    )
+
+    # CTDAgent로 최종 PDF 생성
+    pdf_path = None
+    pdf_filename = None
+    agent_mode = "generate"  # 기본값
+    agent_result = {}
+
+    if CTDAGENT_AVAILABLE and run_ctd_agent:
+        try:
+            logger.debug("CTD ReAct agent starting: files=%s max_steps=10", file_paths)
+
+            agent_result = run_ctd_agent(file_paths=file_paths, max_steps=10)
+
+            # Agent 모드 가져오기
+            agent_mode = agent_result.get("mode", "generate")
+            logger.debug("CTD ReAct agent completed: mode=%s", agent_mode)
+
+            # 모드별 처리
+            if agent_mode == "validate":
+                # 검증 모드: 리포트 경로 확인
+                if agent_result.get("report_path"):
+                    report_path = agent_result["report_path"]
+                    logger.info("Validation report generated: %s", report_path)
+            else:
+                # 생성 모드: PDF 경로 확인
+                if agent_result.get("pdf_path"):
+                    pdf_path = agent_result["pdf_path"]
+                    pdf_filename = Path(pdf_path).name
+                    logger.info("CTDAgent generated PDF: %s", pdf_path)
+                else:
+                    # output 디렉토리에서 최신 PDF 찾기
+                    pdf_path = _latest_pdf(CTDAGENT_OUTPUT_DIR)
+                    if pdf_path:
+                        pdf_filename = Path(pdf_path).name
+                        logger.info("Found latest PDF: %s", pdf_path)
+
+        except Exception:
+            logger.exception("ctd_agent_failed")
+
+    # 대체: CTDMate PDF 생성
+    if not pdf_path and agent_mode == "generate":
+        pdf_path = _get_pdf_gen().generate_pdf(result)
+        pdf_filename = Path(pdf_path).name
+
+    # 응답 구성
+    response = {
+        "ok": result.get("ok", False),
+        "mode": agent_mode,  # Agent 모드 전달
+        "files": uploaded_files,
+        "result": result
+    }
+
+    # 생성 모드: PDF 정보 추가
+    if agent_mode == "generate" and pdf_path:
+        response["pdf"] = {
+            "filename": pdf_filename,
+            "path": pdf_path,
+            "download_url": f"/v1/download/{pdf_filename}",
+            "preview_url": f"/v1/preview/{pdf_filename}"
+        }
+
+        # Module 2 PDF 정보도 추가 (있는 경우)
+        if agent_result.get("module2_pdf_path"):
+            module2_path = agent_result["module2_pdf_path"]
+            module2_filename = Path(module2_path).name
+            response["module2_pdf"] = {
+                "filename": module2_filename,
+                "path": module2_path,
+                "download_url": f"/v1/download/{module2_filename}",
+                "preview_url": f"/v1/preview/{module2_filename}"
+            }
+
+    # 검증 모드: 검증 리포트 정보 추가
+    elif agent_mode == "validate":
+        validation_info = {
+            "report_path": agent_result.get("report_path"),
+            "summary": agent_result.get("summary", {}),
+            "final_message": agent_result.get("final_message")
+        }
+
+        # 스키마 체크 정보가 있으면 추가
+        if "schema_check" in agent_result:
+            schema_check = agent_result["schema_check"]
+            validation_info["schema_check"] = schema_check
+
+            # 누락 항목을 리스트로 변환 (웹 UI 표시용)
+            if schema_check.get("missing_items"):
+                validation_info["missing_items"] = [
+                    f"{item.get('id', '')}: {item.get('title', '')}"
+                    for item in schema_check["missing_items"][:10]  # 최대 10개만
+                ]
+
+            # 발견된 항목을 리스트로 변환
+            if schema_check.get("found_items"):
+                validation_info["passed_items"] = [
+                    f"{item.get('id', '')}: {item.get('title', '')}"
+                    for item in schema_check["found_items"][:10]  # 최대 10개만
+                ]
+
+        response["validation"] = validation_info
+
+        # 검증 리포트를 다운로드 가능하도록
+        if agent_result.get("report_path"):
+            report_filename = Path(agent_result["report_path"]).name
+            response["validation"]["download_url"] = f"/v1/download/{report_filename}"
+
+    if response["ok"]:
+        _store_cached_response(cache_key, response)
+
+    return response
+
+
+def _get_exec() -> ThreadPoolExecutor:
+    global _EXEC
+    if _EXEC is None:
+        with _init_lock:
+            if _EXEC is None:
+                _EXEC = ThreadPoolExecutor(max_workers=_JOB_WORKERS, thread_name_prefix="ctd-job")
+    return _EXEC
+
+
+def _job_path(job_id: str) -> Optional[Path]:
+    """작업 기록 파일 경로 (job_id 형식이 아니면 None)"""
+    if not _HEX_KEY_RE.fullmatch(job_id):
+        return None
+    return _JOBS_DIR / f"{job_id}.json"
+
+
+def _write_job(job_id: str, status: str, **fields: Any) -> None:
+    """작업 기록을 임시 파일에 쓴 뒤 교체 (조회 중인 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록)"""
+    path = _JOBS_DIR / f"{job_id}.json"
+    tmp = path.with_name(f"{job_id}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(orjson.dumps({"job_id": job_id, "status": status, **fields}, default=str, option=_JSON_OPTS))
+    os.replace(tmp, path)
+
+
+def _prune_jobs() -> None:
+    """최근 _MAX_JOBS개만 남기고 오래된 작업 기록과 그 업로드 디렉토리 삭제"""
+    entries = []
+    with os.scandir(_JOBS_DIR) as it:
+        for e in it:
+            if not e.name.endswith(".json"):
+                continue
+            try:
+                entries.append((e.stat().st_mtime_ns, e.path))
+            except OSError:
+                continue  # 다른 프로세스가 먼저 삭제
+    entries.sort(reverse=True)
+    for _, path in entries[_MAX_JOBS:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        shutil.rmtree(UPLOAD_DIR / Path(path).stem, ignore_errors=True)
+
+
+def _run_job(job_id: str, file_paths: List[str], uploaded_files: List[Dict[str, Any]], cache_key: str) -> None:
+    """작업 스레드 본체: 상태를 running → done/error로 기록"""
+    _write_job(job_id, "running")
+    try:
+        result = _run_pipeline(file_paths, uploaded_files, cache_key)
+    except Exception as e:
+        logger.exception("generate_ctd_job_failed")
+        _write_job(job_id, "error", detail=str(e))
+        return
+    _write_job(job_id, "done", result=result)
+
+
+def _submit_job(job_id: str, file_paths: List[str], uploaded_files: List[Dict[str, Any]], cache_key: str,
+                cached: Optional[Dict[str, Any]] = None) -> str:
+    """작업 기록 생성 후 기록한 상태 반환 (cached가 있으면 done으로 바로 기록, 아니면 queued)"""
+    _JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    if cached is not None:
+        status = "done"
+        _write_job(job_id, status, result=cached)
+    else:
+        status = "queued"
+        _write_job(job_id, status)
+        _get_exec().submit(_run_job, job_id, file_paths, uploaded_files, cache_key)
+    _prune_jobs()
+    return status
+
+
+@app.post("/v1/generate-ctd", response_model=None, status_code=202)
 async def generate_ctd(files: List[UploadFile] = File(...)) -> Dict[str, Any]:
-    """파일 업로드 후 CTD 문서 생성 (CTDAgent 통합)"""
+    """파일 업로드 후 CTD 문서 생성 작업 등록 (CTDAgent 통합, 결과는 /v1/jobs/{job_id}로 조회)"""
+    # 작업은 나중에 실행되므로 업로드는 작업별 디렉토리에 저장 (같은 이름의 다른 요청이 덮어쓰지 않도록)
+    job_id = uuid4().hex
+    job_dir = UPLOAD_DIR / job_id
     try:
+        job_dir.mkdir(parents=True)
+
         # 파일 저장
         file_paths = []
         uploaded_files = []
         for file in files:
-            ext = Path(file.filename).suffix.lower()
-            if ext not in ['.pdf', '.xlsx', '.csv', '.xls']:
+            ext = os.path.splitext(file.filename)[1].lower()
+            if ext not in _ALLOWED_EXT:
                 raise HTTPException(status_code=400, detail=f"Unsupported file type: {ext}")
 
-            file_path = UPLOAD_DIR / file.filename
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            file_path = job_dir / Path(file.filename).name
+            size = await run_in_threadpool(_fast_save, file, file_path)
             file_paths.append(str(file_path))
             uploaded_files.append({
                 "filename": file.filename,
                 "path": str(file_path),
-                "size": file_path.stat().st_size
+                "size": size
             })
 
-        # CTDMate 파이프라인 실행 (검증 및 분석)
-        result = _fsm.run(
-            desc="Generate CTD 2.3.P.1 documents from uploaded composition files",
-            files=file_paths,
-            section="M2.3.P.1",
-            output_format="yaml",
-            auto_fix=True,
-        )
-
-        # CTDAgent로 최종 PDF 생성
-        pdf_path = None
-        pdf_filename = None
-        agent_mode = "generate"  # 기본값
-        agent_result = {}
+        # 같은 파일이면 캐시된 결과를 완료된 작업으로 등록
+        cache_key = await run_in_threadpool(_hash_files, file_paths)
+        cached = await run_in_threadpool(_load_cached_response, cache_key)
+        if cached is not None:
+            logger.info("Agent cache hit: %s", cache_key)
+            cached["files"] = uploaded_files
+        status = await run_in_threadpool(_submit_job, job_id, file_paths, uploaded_files, cache_key, cached)
 
-        if CTDAGENT_AVAILABLE and run_ctd_agent:
-            try:
-                print("\n" + "="*80)
-                print("🤖 CTD ReAct AGENT STARTING")
-                print("="*80)
-                print(f"📁 Input files: {file_paths}")
-                print(f"⚙️  Max steps: 10")
-                print("="*80 + "\n")
-
-                agent_result = run_ctd_agent(file_paths=file_paths, max_steps=10)
-
-                # Agent 모드 가져오기
-                agent_mode = agent_result.get("mode", "generate")
-                print("\n" + "="*80)
-                print(f"✅ AGENT COMPLETED - Mode: {agent_mode.upper()}")
-                print("="*80 + "\n")
-
-                # 모드별 처리
-                if agent_mode == "validate":
-                    # 검증 모드: 리포트 경로 확인
-                    if agent_result.get("report_path"):
-                        report_path = agent_result["report_path"]
-                        print(f"✓ Validation report generated: {report_path}")
-                else:
-                    # 생성 모드: PDF 경로 확인
-                    if agent_result.get("pdf_path"):
-                        pdf_path = agent_result["pdf_path"]
-                        pdf_filename = Path(pdf_path).name
-                        print(f"✓ CTDAgent generated PDF: {pdf_path}")
-                    else:
-                        # output 디렉토리에서 최신 PDF 찾기
-                        if CTDAGENT_OUTPUT_DIR.exists():
-                            pdf_files = list(CTDAGENT_OUTPUT_DIR.glob("*.pdf"))
-                            if pdf_files:
-                                # 가장 최근 파일 선택
-                                pdf_path = str(max(pdf_files, key=lambda p: p.stat().st_mtime))
-                                pdf_filename = Path(pdf_path).name
-                                print(f"✓ Found latest PDF: {pdf_path}")
-
-            except Exception as e:
-                print(f"CTDAgent error: {e}")
-                import traceback
-                traceback.print_exc()
-
-        # 대체: CTDMate PDF 생성
-        if not pdf_path and agent_mode == "generate":
-            pdf_path = _pdf_gen.generate_pdf(result)
-            pdf_filename = Path(pdf_path).name
-
-        # 응답 구성
-        response = {
-            "ok": result.get("ok", False),
-            "mode": agent_mode,  # Agent 모드 전달
-            "files": uploaded_files,
-            "result": result
-        }
-
-        # 생성 모드: PDF 정보 추가
-        if agent_mode == "generate" and pdf_path:
-            response["pdf"] = {
-                "filename": pdf_filename,
-                "path": pdf_path,
-                "download_url": f"/v1/download/{pdf_filename}",
-                "preview_url": f"/v1/preview/{pdf_filename}"
-            }
-
-            # Module 2 PDF 정보도 추가 (있는 경우)
-            if agent_result.get("module2_pdf_path"):
-                module2_path = agent_result["module2_pdf_path"]
-                module2_filename = Path(module2_path).name
-                response["module2_pdf"] = {
-                    "filename": module2_filename,
-                    "path": module2_path,
-                    "download_url": f"/v1/download/{module2_filename}",
-                    "preview_url": f"/v1/preview/{module2_filename}"
-                }
-
-        # 검증 모드: 검증 리포트 정보 추가
-        elif agent_mode == "validate":
-            validation_info = {
-                "report_path": agent_result.get("report_path"),
-                "summary": agent_result.get("summary", {}),
-                "final_message": agent_result.get("final_message")
-            }
-
-            # 스키마 체크 정보가 있으면 추가
-            if "schema_check" in agent_result:
-                schema_check = agent_result["schema_check"]
-                validation_info["schema_check"] = schema_check
-
-                # 누락 항목을 리스트로 변환 (웹 UI 표시용)
-                if schema_check.get("missing_items"):
-                    validation_info["missing_items"] = [
-                        f"{item.get('id', '')}: {item.get('title', '')}"
-                        for item in schema_check["missing_items"][:10]  # 최대 10개만
-                    ]
-
-                # 발견된 항목을 리스트로 변환
-                if schema_check.get("found_items"):
-                    validation_info["passed_items"] = [
-                        f"{item.get('id', '')}: {item.get('title', '')}"
-                        for item in schema_check["found_items"][:10]  # 최대 10개만
-                    ]
-
-            response["validation"] = validation_info
-
-            # 검증 리포트를 다운로드 가능하도록
-            if agent_result.get("report_path"):
-                report_filename = Path(agent_result["report_path"]).name
-                response["validation"]["download_url"] = f"/v1/download/{report_filename}"
-
-        return response
+        return {"ok": True, "job_id": job_id, "status": status}
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("generate_ctd_failed")
+        shutil.rmtree(job_dir, ignore_errors=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/v1/jobs/{job_id}", response_model=None)
+def get_job(job_id: str) -> Response:
+    """CTD 생성 작업 상태 조회 (queued/running/error/done, 완료 시 결과 포함)"""
+    path = _job_path(job_id)
+    try:
+        # 기록 파일이 이미 응답 JSON이므로 다시 직렬화하지 않고 그대로 반환
+        content = path.read_bytes() if path is not None else None
+    except FileNotFoundError:
+        content = None
+    if content is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return Response(content=content, media_type="application/json")
+
+
 @app.get("/v1/download/{filename}")
-async def download_pdf(filename: str):
-    """파일 다운로드 (PDF, Markdown 리포트 등)"""
+async def download_pdf(filename: str, request: Request, cache: Optional[str] = None):
+    """파일 다운로드 (PDF, Markdown 리포트 등, cache: 캐시된 결과의 항목 키)"""
     # 파일 확장자에 따른 MIME type 설정
     ext = Path(filename).suffix.lower()
     mime_types = {
@@ -348,50 +852,27 @@ async def download_pdf(filename: str):
     }
     media_type = mime_types.get(ext, "application/octet-stream")
 
-    # CTDMate output 먼저 확인
-    file_path = OUTPUT_DIR / filename
-    if file_path.exists():
-        return FileResponse(
-            path=str(file_path),
-            filename=filename,
-            media_type=media_type
-        )
-
-    # CTDAgent output 확인
-    if CTDAGENT_OUTPUT_DIR.exists():
-        ctd_file_path = CTDAGENT_OUTPUT_DIR / filename
-        if ctd_file_path.exists():
-            return FileResponse(
-                path=str(ctd_file_path),
-                filename=filename,
-                media_type=media_type
-            )
+    # cache가 있으면 캐시 항목, 없으면 CTDMate output → CTDAgent output 순으로 확인 (stat은 스레드에서)
+    found = await asyncio.to_thread(_find_output, filename, cache)
+    if found is not None:
+        return _file_response(request, found, media_type, filename=filename)
 
     raise HTTPException(status_code=404, detail="File not found")
 
 
 @app.get("/v1/preview/{filename}")
-async def preview_pdf(filename: str):
-    """PDF 파일 미리보기 (브라우저에서 열기)"""
-    # CTDMate output 먼저 확인
-    file_path = OUTPUT_DIR / filename
-    if file_path.exists():
-        return FileResponse(
-            path=str(file_path),
-            media_type="application/pdf",
+async def preview_pdf(filename: str, request: Request, cache: Optional[str] = None):
+    """PDF 파일 미리보기 (브라우저에서 열기, cache: 캐시된 결과의 항목 키)"""
+    # cache가 있으면 캐시 항목, 없으면 CTDMate output → CTDAgent output 순으로 확인 (stat은 스레드에서)
+    found = await asyncio.to_thread(_find_output, filename, cache)
+    if found is not None:
+        return _file_response(
+            request,
+            found,
+            "application/pdf",
             headers={"Content-Disposition": f"inline; filename={filename}"}
         )
 
-    # CTDAgent output 확인
-    if CTDAGENT_OUTPUT_DIR.exists():
-        ctd_file_path = CTDAGENT_OUTPUT_DIR / filename
-        if ctd_file_path.exists():
-            return FileResponse(
-                path=str(ctd_file_path),
-                media_type="application/pdf",
-                headers={"Content-Disposition": f"inline; filename={filename}"}
-            )
-
     raise HTTPException(status_code=404, detail="File not found")
 
 
@@ -407,4 +888,11 @@ async def index():
 # ---------- 로컬 실행 ----------
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("ctdmate.app.router:app", host="0.0.0.0", port=8000, reload=False)
+    uvicorn.run(
+        "ctdmate.app.router:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=False,
+        workers=CFG.WEB_CONCURRENCY,
+        log_level="info",
+    )
@@ -1,9 +1,18 @@
 #!/usr/bin/env python
 """YAML 파일들을 CTD 형식 PDF로 변환"""
+import os
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 import yaml
 
+# libyaml C 로더 우선 사용
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # 프로젝트 루트를 Python path에 추가
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -21,75 +30,103 @@ def yaml_to_markdown(yaml_file: Path) -> str:
 
     # YAML을 파싱해서 보기 좋게 변환
     try:
-        data = yaml.safe_load(content)
+        data = yaml.load(content, Loader=SafeLoader)
         return format_yaml_as_markdown(data)
     except:
         # YAML 파싱 실패시 원본 반환
         return content
 
-def format_yaml_as_markdown(data, level=0) -> str:
-    """YAML 데이터를 마크다운 형식으로 변환"""
-    lines = []
-    indent = "  " * level
+# 마크다운 줄 판별: 제목(#~###) 또는 구분선(---)
+_LINE_RE = re.compile(r'^(?P<h>#{1,3}) (?P<t>.*)$|^(?P<hr>---)')
+# **굵게** 인라인 (한 줄의 여러 구간을 한 번에 변환)
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+
+# 레벨별 들여쓰기 문자열 캐시
+_INDENTS = ["  " * level for level in range(16)]
+
+
+def _indent(level: int) -> str:
+    return _INDENTS[level] if level < len(_INDENTS) else "  " * level
+
+
+def _format(data, level: int, out: list) -> None:
+    """YAML 데이터를 마크다운 줄로 변환해 out에 추가 (하위 호출도 같은 리스트 사용)"""
+    indent = _indent(level)
 
     if isinstance(data, dict):
         for key, value in data.items():
             if isinstance(value, dict):
-                lines.append(f"{indent}**{key}:**\n")
-                lines.append(format_yaml_as_markdown(value, level + 1))
+                out.append(f"{indent}**{key}:**\n")
+                _format(value, level + 1, out)
             elif isinstance(value, list):
-                lines.append(f"{indent}**{key}:**\n")
+                out.append(f"{indent}**{key}:**\n")
                 for item in value:
                     if isinstance(item, dict):
-                        lines.append(format_yaml_as_markdown(item, level + 1))
+                        _format(item, level + 1, out)
                     else:
-                        lines.append(f"{indent}- {item}\n")
+                        out.append(f"{indent}- {item}\n")
             else:
-                lines.append(f"{indent}**{key}:** {value}\n")
+                out.append(f"{indent}**{key}:** {value}\n")
     elif isinstance(data, list):
         for item in data:
             if isinstance(item, dict):
-                lines.append(format_yaml_as_markdown(item, level))
+                _format(item, level, out)
             else:
-                lines.append(f"{indent}- {item}\n")
+                out.append(f"{indent}- {item}\n")
     else:
-        lines.append(f"{indent}{data}\n")
+        out.append(f"{indent}{data}\n")
+
+
+def format_yaml_as_markdown(data, level=0) -> str:
+    """YAML 데이터를 마크다운 형식으로 변환"""
+    out = []
+    _format(data, level, out)
+    return "".join(out)
+
+# CTD 모듈 순서 (파일명, 제목)
+_MODULES = (
+    ("M1.yaml", "제1부 행정정보 및 처방정보"),
+    ("M2_3.yaml", "제2부 - 2.3 품질평가자료요약"),
+    ("M2_4.yaml", "제2부 - 2.4 비임상시험자료개요"),
+    ("M2_5.yaml", "제2부 - 2.5 임상시험자료개요"),
+    ("M2_6.yaml", "제2부 - 2.6 비임상시험자료요약문"),
+    ("M2_7.yaml", "제2부 - 2.7 임상시험자료요약"),
+)
+
+
+@lru_cache(maxsize=8)
+def _load_module(path: str, mtime_ns: int) -> str:
+    """모듈 YAML 읽기 + ```yaml 코드 블록 제거 (수정 시각이 같으면 캐시 사용)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    if content.strip().startswith('```yaml'):
+        lines = content.split('\n')
+        content = '\n'.join(lines[1:-1]) if len(lines) > 2 else content
+    return content
 
-    return "".join(lines)
 
 def create_ctd_pdf(output_dir: Path, pdf_path: Path):
     """CTD YAML 파일들을 하나의 PDF로 통합"""
 
-    # CTD 모듈 순서
-    modules = [
-        ("M1.yaml", "제1부 행정정보 및 처방정보"),
-        ("M2_3.yaml", "제2부 - 2.3 품질평가자료요약"),
-        ("M2_4.yaml", "제2부 - 2.4 비임상시험자료개요"),
-        ("M2_5.yaml", "제2부 - 2.5 임상시험자료개요"),
-        ("M2_6.yaml", "제2부 - 2.6 비임상시험자료요약문"),
-        ("M2_7.yaml", "제2부 - 2.7 임상시험자료요약"),
-    ]
-
     # 통합 마크다운 생성
     markdown_parts = []
     markdown_parts.append("# 국제공통기술문서(CTD) - TM-5 용액\n\n")
     markdown_parts.append("---\n\n")
 
-    for filename, title in modules:
-        file_path = output_dir / filename
-        if file_path.exists():
+    # 디렉토리를 한 번만 훑어 존재하는 파일 확인
+    with os.scandir(output_dir) as it:
+        present = {e.name: e for e in it if e.is_file()}
+
+    for filename, title in _MODULES:
+        entry = present.get(filename)
+        if entry is not None:
             print(f"  ✓ {filename} 처리 중...")
             markdown_parts.append(f"\n\n# {title}\n\n")
             markdown_parts.append("---\n\n")
 
-            # YAML 내용 읽기
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # ```yaml 코드 블록 제거
-            if content.strip().startswith('```yaml'):
-                lines = content.split('\n')
-                content = '\n'.join(lines[1:-1]) if len(lines) > 2 else content
+            # YAML 내용 읽기 (```yaml 코드 블록 제거)
+            content = _load_module(entry.path, entry.stat().st_mtime_ns)
 
             markdown_parts.append(content)
             markdown_parts.append("\n\n")
@@ -108,7 +145,6 @@ def create_ctd_pdf(output_dir: Path, pdf_path: Path):
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
         from reportlab.lib.units import inch
-        import os
 
         # 한글 폰트 등록 시도
         font_name = "Helvetica"
@@ -136,47 +172,58 @@ def create_ctd_pdf(output_dir: Path, pdf_path: Path):
         styles = getSampleStyleSheet()
         story = []
 
+        # 제목 레벨 → (스타일명, 뒤에 붙일 Spacer 높이)
+        heading_rules = {
+            1: ('Title', 0.2*inch),
+            2: ('Heading1', 0.1*inch),
+            3: ('Heading2', None),
+        }
+
+        # 연속된 일반 텍스트 줄은 <br/>로 묶어 Paragraph 하나로 생성
+        body = []
+
+        def flush_body():
+            if not body:
+                return
+            try:
+                story.append(Paragraph("<br/>".join(body), styles['Normal']))
+            except:
+                # 특수문자 처리 실패시 줄 단위로 다시 시도 (실패한 줄만 생략)
+                for text in body:
+                    try:
+                        story.append(Paragraph(text, styles['Normal']))
+                    except:
+                        pass
+            body.clear()
+
         # 마크다운을 줄 단위로 처리
         lines = full_markdown.split('\n')
         for line in lines:
             if not line.strip():
+                flush_body()
                 story.append(Spacer(1, 0.1*inch))
                 continue
 
             # 간단한 마크다운 처리
-            if line.startswith('# '):
-                # 제목
-                text = line.replace('# ', '')
-                para = Paragraph(f"<b>{text}</b>", styles['Title'])
-                story.append(para)
-                story.append(Spacer(1, 0.2*inch))
-            elif line.startswith('## '):
-                # 소제목
-                text = line.replace('## ', '')
-                para = Paragraph(f"<b>{text}</b>", styles['Heading1'])
-                story.append(para)
-                story.append(Spacer(1, 0.1*inch))
-            elif line.startswith('### '):
-                # 작은 제목
-                text = line.replace('### ', '')
-                para = Paragraph(f"<b>{text}</b>", styles['Heading2'])
-                story.append(para)
-            elif line.startswith('---'):
+            m = _LINE_RE.match(line)
+            if m is None:
+                # 일반 텍스트 (볼드 처리)
+                body.append(_BOLD_RE.sub(r'<b>\1</b>', line))
+                continue
+
+            flush_body()
+            if m.group('hr'):
                 # 구분선
                 story.append(Spacer(1, 0.1*inch))
-            else:
-                # 일반 텍스트
-                # 볼드 처리
-                text = line.replace('**', '<b>', 1)
-                if '<b>' in text:
-                    text = text.replace('**', '</b>', 1)
-
-                try:
-                    para = Paragraph(text, styles['Normal'])
-                    story.append(para)
-                except:
-                    # 특수문자 처리 실패시 원본 사용
-                    pass
+                continue
+
+            # 제목 (# → Title, ## → Heading1, ### → Heading2)
+            style_name, spacer = heading_rules[len(m.group('h'))]
+            story.append(Paragraph(f"<b>{m.group('t')}</b>", styles[style_name]))
+            if spacer:
+                story.append(Spacer(1, spacer))
+
+        flush_body()
 
         # PDF 빌드
         doc.build(story)
@@ -0,0 +1,78 @@
+# ctdmate/tests/test_agent.py
+from __future__ import annotations
+import sys
+from pathlib import Path
+import pytest
+
+# CTDAgent는 패키지가 아니므로 라우터와 같은 방식으로 경로에 추가
+CTDAGENT_PATH = Path(__file__).resolve().parents[2] / "CTDAgent"
+sys.path.insert(0, str(CTDAGENT_PATH))
+
+# agent.py는 llama_cpp를 바로 import하므로 없으면 이 모듈만 건너뜀
+pytest.importorskip("llama_cpp")
+import agent as agent_mod  # noqa: E402
+
+def _no_llama():
+    raise AssertionError("fast path must not load Llama")
+
+def _fake_tools(calls):
+    def parse_documents(args, state):
+        calls.append("parse_documents")
+        return {"ok": True, "results": [{"text": "문서 본문"}], "total_files": 1}
+
+    def generate_validation_report(args, state):
+        calls.append("generate_validation_report")
+        return {"ok": True, "report_path": "output/report.md", "summary": {"passed": 1}}
+
+    def generate_all_modules(args, state):
+        calls.append("generate_all_modules")
+        return {"ok": True, "modules": [{"module": "M2.3"}]}
+
+    def save_as_pdf(args, state):
+        calls.append("save_as_pdf")
+        return {"ok": True, "path": "output/CTD_Complete.pdf", "size": 10}
+
+    return {f.__name__: f for f in (parse_documents, generate_validation_report, generate_all_modules, save_as_pdf)}
+
+def test_agent_state_to_dict_skips_unset():
+    state = agent_mod.AgentState(mode="validate", report_path="r.md")
+    out = state.to_dict()
+    assert out == {"mode": "validate", "parsed_content": "", "report_path": "r.md"}
+
+def test_fast_path_generate(monkeypatch):
+    calls = []
+    monkeypatch.setattr(agent_mod, "TOOLS", _fake_tools(calls))
+    monkeypatch.setattr(agent_mod, "FAST_PATH", True)
+    monkeypatch.setattr(agent_mod, "_get_llama", _no_llama)
+
+    out = agent_mod.run_agent(file_paths=["composition_data.xlsx"])
+    assert calls == ["generate_all_modules", "save_as_pdf"]
+    assert out["mode"] == "generate"
+    assert out["pdf_path"] == "output/CTD_Complete.pdf"
+    assert out["modules_generated"] == [{"module": "M2.3"}]
+
+def test_fast_path_validate_keeps_parsed_content(monkeypatch):
+    calls = []
+    monkeypatch.setattr(agent_mod, "TOOLS", _fake_tools(calls))
+    monkeypatch.setattr(agent_mod, "FAST_PATH", True)
+    monkeypatch.setattr(agent_mod, "_get_llama", _no_llama)
+
+    out = agent_mod.run_agent(file_paths=["submitted.pdf"])
+    assert calls == ["parse_documents", "generate_validation_report"]
+    assert out["mode"] == "validate"
+    assert out["parsed_content"] == "문서 본문"
+    assert out["report_path"] == "output/report.md"
+
+def test_generate_without_excel_falls_back_to_llm(monkeypatch):
+    # Excel/CSV가 없으면 고정 워크플로우 대신 기존처럼 LLM 루프로 진행
+    calls, prompts = [], []
+    monkeypatch.setattr(agent_mod, "TOOLS", _fake_tools(calls))
+    monkeypatch.setattr(agent_mod, "FAST_PATH", True)
+    monkeypatch.setattr(agent_mod, "_get_llama", lambda: object())
+    monkeypatch.setattr(agent_mod._llama_batcher, "submit", lambda history: prompts.append(history) or "FinalAnswer: 완료")
+
+    out = agent_mod.run_agent(texts=["당뇨병 치료제 개요"])
+    assert len(prompts) == 1
+    assert calls == []
+    assert out["mode"] == "generate"
+    assert out["final_message"] == "완료"
@@ -0,0 +1,155 @@
+# ctdmate/tests/test_api.py
+from __future__ import annotations
+import io
+import os
+import tempfile
+import threading
+from pathlib import Path
+from fastapi.testclient import TestClient
+from ctdmate.app import router as router_mod
+
+class FakeUpload:
+    def __init__(self, f):
+        self.file = f
+
+def _client(monkeypatch, tmp_path: Path) -> TestClient:
+    # 업로드/출력/작업 기록은 모두 tmp_path 아래로
+    monkeypatch.setattr(router_mod, "UPLOAD_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(router_mod, "OUTPUT_DIR", tmp_path / "output")
+    monkeypatch.setattr(router_mod, "CTDAGENT_OUTPUT_DIR", tmp_path / "agent_output")
+    monkeypatch.setattr(router_mod, "_JOBS_DIR", tmp_path / "output" / ".jobs")
+    monkeypatch.setattr(router_mod, "_AGENT_CACHE_DIR", tmp_path / "output" / ".agent_cache")
+    for d in ("uploads", "output"):
+        (tmp_path / d).mkdir()
+    return TestClient(router_mod.app)
+
+def _count_sendfile(monkeypatch) -> list:
+    calls = []
+    real = os.sendfile
+
+    def counting(*args):
+        calls.append(args)
+        return real(*args)
+
+    monkeypatch.setattr(router_mod.os, "sendfile", counting)
+    return calls
+
+def test_fast_save_in_memory_spool(monkeypatch, tmp_path):
+    calls = _count_sendfile(monkeypatch)
+    f = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    f.write(b"hello world")
+    f.seek(0)
+    n = router_mod._fast_save(FakeUpload(f), tmp_path / "out")
+    assert n == 11
+    assert (tmp_path / "out").read_bytes() == b"hello world"
+    # 메모리 업로드는 디스크로 롤오버하지 않고 버퍼 복사
+    assert f.name is None
+    assert calls == []
+
+def test_fast_save_rolled_spool(monkeypatch, tmp_path):
+    calls = _count_sendfile(monkeypatch)
+    f = tempfile.SpooledTemporaryFile(max_size=4)
+    f.write(b"hello world")
+    f.seek(6)
+    n = router_mod._fast_save(FakeUpload(f), tmp_path / "out")
+    assert n == 5
+    assert (tmp_path / "out").read_bytes() == b"world"
+    assert calls
+
+def test_fast_save_without_fileno(tmp_path):
+    n = router_mod._fast_save(FakeUpload(io.BytesIO(b"abc" * 1000)), tmp_path / "out")
+    assert n == 3000
+    assert (tmp_path / "out").read_bytes() == b"abc" * 1000
+
+def test_download_etag_304(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path)
+    (tmp_path / "output" / "a.pdf").write_bytes(b"%PDF-1.4 test")
+
+    resp = client.get("/v1/download/a.pdf")
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "no-cache"
+    etag = resp.headers["etag"]
+
+    for header in (etag, f'"other", W/{etag}', "*"):
+        r = client.get("/v1/download/a.pdf", headers={"If-None-Match": header})
+        assert r.status_code == 304, header
+        assert r.headers["etag"] == etag
+
+    # 부분 문자열만 같은 태그는 일치로 보지 않음
+    r = client.get("/v1/download/a.pdf", headers={"If-None-Match": f'"x{etag[1:]}'})
+    assert r.status_code == 200
+
+def _drain_jobs():
+    # 작업 풀(기본 1 스레드)은 FIFO이므로 빈 작업이 끝나면 앞선 작업도 끝난 상태
+    router_mod._get_exec().submit(lambda: None).result()
+
+def test_generate_ctd_job_lifecycle(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path)
+    calls = []
+
+    def fake_pipeline(file_paths, uploaded_files, cache_key):
+        calls.append(file_paths)
+        return {"ok": True, "mode": "generate", "files": uploaded_files}
+
+    monkeypatch.setattr(router_mod, "_run_pipeline", fake_pipeline)
+
+    resp = client.post("/v1/generate-ctd", files=[("files", ("data.csv", b"a,b\n1,2\n", "text/csv"))])
+    assert resp.status_code == 202
+    assert resp.json()["status"] == "queued"
+    job_id = resp.json()["job_id"]
+
+    _drain_jobs()
+    job = client.get(f"/v1/jobs/{job_id}").json()
+    assert job["status"] == "done"
+    assert job["result"]["files"][0]["filename"] == "data.csv"
+    # 업로드는 작업별 디렉토리에 저장
+    assert calls == [[str(tmp_path / "uploads" / job_id / "data.csv")]]
+
+def test_generate_ctd_same_filename_isolated(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path)
+    seen = {}
+
+    def fake_pipeline(file_paths, uploaded_files, cache_key):
+        seen[cache_key] = Path(file_paths[0]).read_bytes()
+        return {"ok": True}
+
+    monkeypatch.setattr(router_mod, "_run_pipeline", fake_pipeline)
+
+    # 작업 스레드를 막아 두 요청이 모두 등록된 뒤에 실행되게 함
+    release = threading.Event()
+    router_mod._get_exec().submit(release.wait, 10)
+    ids = [
+        client.post("/v1/generate-ctd", files=[("files", ("data.csv", body, "text/csv"))]).json()["job_id"]
+        for body in (b"first", b"second")
+    ]
+    assert all(client.get(f"/v1/jobs/{i}").json()["status"] == "queued" for i in ids)
+    release.set()
+    _drain_jobs()
+    assert sorted(seen.values()) == [b"first", b"second"]
+    assert all(client.get(f"/v1/jobs/{i}").json()["status"] == "done" for i in ids)
+
+def test_generate_ctd_cache_hit_reports_done(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path)
+    monkeypatch.setattr(router_mod, "_load_cached_response", lambda key: {"ok": True, "mode": "generate"})
+
+    resp = client.post("/v1/generate-ctd", files=[("files", ("data.csv", b"x", "text/csv"))])
+    assert resp.json()["status"] == "done"
+    job = client.get(f"/v1/jobs/{resp.json()['job_id']}").json()
+    assert job["status"] == "done"
+    assert job["result"]["files"][0]["filename"] == "data.csv"
+
+def test_generate_ctd_job_error_and_unknown(monkeypatch, tmp_path):
+    client = _client(monkeypatch, tmp_path)
+
+    def broken_pipeline(file_paths, uploaded_files, cache_key):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(router_mod, "_run_pipeline", broken_pipeline)
+
+    job_id = client.post("/v1/generate-ctd", files=[("files", ("data.csv", b"x", "text/csv"))]).json()["job_id"]
+    _drain_jobs()
+    job = client.get(f"/v1/jobs/{job_id}").json()
+    assert job["status"] == "error"
+    assert "boom" in job["detail"]
+
+    assert client.get("/v1/jobs/" + "0" * 32).status_code == 404
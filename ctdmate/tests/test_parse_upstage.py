@@ -0,0 +1,57 @@
+# ctdmate/tests/test_parse_upstage.py
+from __future__ import annotations
+import sys
+from pathlib import Path
+
+# CTDAgent는 패키지가 아니므로 라우터와 같은 방식으로 경로에 추가
+CTDAGENT_PATH = Path(__file__).resolve().parents[2] / "CTDAgent"
+sys.path.insert(0, str(CTDAGENT_PATH))
+
+from tools import parse_upstage  # noqa: E402
+
+def _setup(monkeypatch, tmp_path: Path, calls: list):
+    def fake_run(paths):
+        calls.append(Path(paths[0]).name)
+        if paths[0].endswith("bad.pdf"):
+            return {"ok": False, "errors": ["upstage 500"], "results": []}
+        return {"ok": True, "results": [{"text": "ok"}]}
+
+    monkeypatch.setattr(parse_upstage, "UPSTAGE_AVAILABLE", True)
+    monkeypatch.setattr(parse_upstage, "upstage_parse_run", fake_run)
+    monkeypatch.setattr(parse_upstage, "PARSE_CACHE_DIR", tmp_path / "cache")
+    parse_upstage._parse_file_cached.cache_clear()
+
+def test_parse_cache_keeps_only_successes(monkeypatch, tmp_path):
+    good = tmp_path / "good.pdf"
+    bad = tmp_path / "bad.pdf"
+    good.write_bytes(b"good")
+    bad.write_bytes(b"bad")
+    calls = []
+    _setup(monkeypatch, tmp_path, calls)
+
+    for _ in range(2):
+        out = parse_upstage.parse_documents([str(good), str(bad)])
+        assert out["ok"] is False
+        assert out["results"] == [{"text": "ok"}]
+        assert "bad.pdf" in out["error"]
+
+    # 성공한 파일은 캐시에서, 실패한 파일은 매번 다시 호출
+    assert calls == ["good.pdf", "bad.pdf", "bad.pdf"]
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+    parse_upstage._parse_file_cached.cache_clear()
+
+def test_parse_cache_returns_independent_results(monkeypatch, tmp_path):
+    good = tmp_path / "good.pdf"
+    good.write_bytes(b"good")
+    calls = []
+    _setup(monkeypatch, tmp_path, calls)
+
+    first = parse_upstage.parse_documents([str(good)])
+    first["results"][0]["text"] = "changed"
+    first["results"].append({"text": "extra"})
+
+    # 호출자가 결과를 수정해도 캐시된 결과는 그대로
+    second = parse_upstage.parse_documents([str(good)])
+    assert second["results"] == [{"text": "ok"}]
+    assert calls == ["good.pdf"]
+    parse_upstage._parse_file_cached.cache_clear()
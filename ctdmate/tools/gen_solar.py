@@ -2,7 +2,7 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-import os, json, time, re
+import os, json, time, re, threading
 
 # config
 try:
@@ -108,6 +108,9 @@ class SolarGenerator:
         self.mfds_rag: Optional[MFDSRAGTool] = None
         self.glossary: Optional[GlossaryRAGTool] = None
         self.normalizer: Optional[TermNormalizer] = None
+        self._http: Any = None  # 공유 HTTP 클라이언트 (set_http)
+        # 로컬 임베딩/Qdrant/정규화 모델은 스레드 안전이 보장되지 않으므로 직렬화 (Solar API 호출만 병렬)
+        self._local_lock = threading.Lock()
 
         if enable_rag:
             try:
@@ -124,9 +127,17 @@ class SolarGenerator:
             except Exception:
                 self.normalizer = None
 
+    def set_http(self, client: Any) -> None:
+        """Upstage 호출에 쓸 공유 HTTP 클라이언트 지정 (httpx.Client 등, None이면 요청마다 requests 사용)"""
+        self._http = client
+
     # --------- Upstage Chat ----------
     def _solar_chat(self, messages: List[Dict[str, str]]) -> str:
-        if requests is None:
+        if self._http is not None:
+            post = self._http.post
+        elif requests is not None:
+            post = requests.post
+        else:
             raise RuntimeError("requests not installed. pip install requests")
         api_key = CFG.UPSTAGE_API_KEY
         if not api_key:
@@ -141,7 +152,7 @@ class SolarGenerator:
         for p in paths:
             try:
                 url = f"{base}{p}"
-                resp = requests.post(url, headers=headers, json=payload, timeout=90)
+                resp = post(url, headers=headers, json=payload, timeout=90)
                 if resp.status_code == 404:
                     last_err = f"404 at {p}"
                     continue
@@ -239,7 +250,8 @@ class SolarGenerator:
         section = _normalize_section(section)
         want_yaml = (output_format or self.output_format).lower() == "yaml"
 
-        ctx = self._retrieve(section, prompt, k=self.max_refs)
+        with self._local_lock:
+            ctx = self._retrieve(section, prompt, k=self.max_refs)
 
         offline_reason = None
         try:
@@ -259,7 +271,8 @@ class SolarGenerator:
         if self.auto_normalize and self.normalizer:
             try:
                 core = re.sub(r"^```yaml|```$", "", text, flags=re.M).strip() if want_yaml else text
-                text_core = self.normalizer.normalize(core)
+                with self._local_lock:
+                    text_core = self.normalizer.normalize(core)
                 text = _ensure_yaml_fence(text_core) if want_yaml else text_core
             except Exception:
                 pass
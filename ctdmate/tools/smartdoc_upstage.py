@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 import time
 import json
@@ -211,6 +212,22 @@ def run(inputs: List[str]) -> dict:
 
     return {"ok": len(errors) == 0, "results": results, "errors": errors}
 
+def merge_runs(outs: List[dict]) -> dict:
+    """파일별 run() 결과를 하나로 합침 (입력 순서 유지)"""
+    results: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    for out in outs:
+        results.extend(out.get("results", []))
+        errors.extend(out.get("errors", []))
+    return {"ok": len(errors) == 0, "results": results, "errors": errors}
+
+def run_batch(inputs: List[str], max_workers: int = 4) -> dict:
+    """여러 파일을 동시에 파싱 (Upstage 호출은 네트워크 대기 위주)"""
+    if len(inputs) <= 1:
+        return run(inputs)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(inputs))) as ex:
+        return merge_runs(list(ex.map(lambda f: run([f]), inputs)))
+
 # ========== CLI ==========
 if __name__ == "__main__":
     import argparse, os, json
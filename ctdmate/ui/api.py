@@ -5,18 +5,20 @@ from __future__ import annotations
 # 단일 ASGI 앱 재노출. 필요 시 CORS 등 미들웨어만 추가.
 from fastapi import FastAPI
 try:
+    from ctdmate.app import config as CFG
     from ctdmate.app.router import app as _core_app
 except Exception:
+    from ..app import config as CFG  # type: ignore
     from ..app.router import app as _core_app  # type: ignore
 
 app: FastAPI = _core_app
 
-# 선택: CORS
+# 선택: CORS (허용 origin은 CTD_CORS_ORIGINS, 고정 목록이면 요청마다 origin을 되돌려 쓰지 않음)
 try:
     from fastapi.middleware.cors import CORSMiddleware
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
+        allow_origins=CFG.CORS_ORIGINS,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
@@ -27,4 +29,11 @@ except Exception:
 # 로컬 실행
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("ctdmate.ui.api:app", host="0.0.0.0", port=8000, reload=False)
+    uvicorn.run(
+        "ctdmate.ui.api:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=False,
+        workers=CFG.WEB_CONCURRENCY,
+        log_level="info",
+    )
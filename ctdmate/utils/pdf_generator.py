@@ -1,8 +1,10 @@
 # ctdmate/utils/pdf_generator.py
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from pathlib import Path
 from datetime import datetime
+from itertools import islice
+import os
 import yaml
 import json
 
@@ -16,6 +18,60 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
 
+KOREAN_FONT = "KoreanFont"
+
+# 생성 결과 본문 표시 한도
+_MAX_TEXT_CHARS = 2000
+_MAX_TEXT_LINES = 200
+
+
+def _register_korean_font() -> Optional[str]:
+    """PDF_TTF 한글 폰트를 프로세스당 한 번만 등록 (실패/미설정 시 None)"""
+    if KOREAN_FONT in pdfmetrics.getRegisteredFontNames():
+        return KOREAN_FONT
+    font_path = os.getenv("PDF_TTF", "")
+    if not font_path or not Path(font_path).exists():
+        return None
+    try:
+        pdfmetrics.registerFont(TTFont(KOREAN_FONT, font_path))
+        return KOREAN_FONT
+    except Exception:
+        return None
+
+
+_FONT_NAME = _register_korean_font()
+
+
+def _bullets(items: Iterable[Any], style: ParagraphStyle) -> Paragraph:
+    """글머리 목록을 Paragraph 하나로 (항목은 <br/>로 구분)"""
+    return Paragraph("<br/>".join(f"• {item}" for item in items), style)
+
+
+# 표 스타일 (TableStyle은 명령 목록일 뿐이므로 여러 표에서 재사용)
+_META_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+_VAL_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+])
+_TRACE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5f7c')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+])
+
+
 class CTDPDFGenerator:
     """CTD 문서를 PDF로 생성하는 유틸리티"""
 
@@ -23,6 +79,32 @@ class CTDPDFGenerator:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
 
+        # 스타일 정의 (인스턴스 생성 시 한 번만)
+        self._styles = getSampleStyleSheet()
+        font_kw = {"fontName": _FONT_NAME} if _FONT_NAME else {}
+        self._title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self._styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#2c5f7c'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            **font_kw,
+        )
+        self._heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=self._styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#3d7a99'),
+            spaceAfter=12,
+            spaceBefore=12,
+            **font_kw,
+        )
+        self._normal_style = (
+            ParagraphStyle('CustomNormal', parent=self._styles['Normal'], **font_kw)
+            if font_kw else self._styles['Normal']
+        )
+
     def generate_pdf(
         self,
         result: Dict[str, Any],
@@ -43,25 +125,9 @@ class CTDPDFGenerator:
             bottomMargin=2*cm,
         )
 
-        # 스타일 정의
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2c5f7c'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-        )
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#3d7a99'),
-            spaceAfter=12,
-            spaceBefore=12,
-        )
-        normal_style = styles['Normal']
+        title_style = self._title_style
+        heading_style = self._heading_style
+        normal_style = self._normal_style
 
         # 문서 빌드
         story = []
@@ -82,15 +148,7 @@ class CTDPDFGenerator:
             meta_data.append(["Format:", plan.get("output_format", "N/A")])
 
         meta_table = Table(meta_data, colWidths=[5*cm, 10*cm])
-        meta_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        meta_table.setStyle(_META_TABLE_STYLE)
         story.append(meta_table)
         story.append(Spacer(1, 0.5*cm))
 
@@ -100,9 +158,12 @@ class CTDPDFGenerator:
             parse_data = result["parse"]
             if parse_data.get("results"):
                 for i, res in enumerate(parse_data["results"], 1):
-                    story.append(Paragraph(f"File {i}: {res.get('input', 'N/A')}", normal_style))
-                    story.append(Paragraph(f"Pages: {res.get('pages', 0)}", normal_style))
-                    story.append(Paragraph(f"Status: {res.get('status', 'N/A')}", normal_style))
+                    story.append(Paragraph(
+                        f"File {i}: {res.get('input', 'N/A')}<br/>"
+                        f"Pages: {res.get('pages', 0)}<br/>"
+                        f"Status: {res.get('status', 'N/A')}",
+                        normal_style,
+                    ))
                     story.append(Spacer(1, 0.3*cm))
             story.append(Spacer(1, 0.5*cm))
 
@@ -122,19 +183,14 @@ class CTDPDFGenerator:
                 val_summary.append(["Compliance:", f"{metrics.get('compliance', 0):.2f}"])
 
             val_table = Table(val_summary, colWidths=[5*cm, 10*cm])
-            val_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ]))
+            val_table.setStyle(_VAL_TABLE_STYLE)
             story.append(val_table)
             story.append(Spacer(1, 0.3*cm))
 
             # 누락 항목
             if val_data.get("missing_required"):
                 story.append(Paragraph("Missing Required Items:", normal_style))
-                for item in val_data["missing_required"]:
-                    story.append(Paragraph(f"• {item}", normal_style))
+                story.append(_bullets(val_data["missing_required"], normal_style))
                 story.append(Spacer(1, 0.3*cm))
 
             story.append(Spacer(1, 0.5*cm))
@@ -144,15 +200,21 @@ class CTDPDFGenerator:
             story.append(Paragraph("3. Generated CTD Content", heading_style))
             gen_data = result["generate"]
 
-            if gen_data.get("text"):
-                text_content = gen_data["text"][:2000]  # 처음 2000자만
-                if len(gen_data["text"]) > 2000:
-                    text_content += "..."
+            full_text = gen_data.get("text") or ""
+            if full_text:
+                # 처음 2000자만 (초과 시 ...)
+                text_content = full_text[:_MAX_TEXT_CHARS] + ("..." if len(full_text) > _MAX_TEXT_CHARS else "")
 
-                # 여러 줄로 나누어 표시
-                for line in text_content.split('\n'):
+                # 빈 줄로 구분된 블록마다 Paragraph 하나 (줄은 <br/>로 연결, 최대 200줄)
+                block = []
+                for line in islice(text_content.splitlines(), _MAX_TEXT_LINES):
                     if line.strip():
-                        story.append(Paragraph(line, normal_style))
+                        block.append(line)
+                    elif block:
+                        story.append(Paragraph("<br/>".join(block), normal_style))
+                        block = []
+                if block:
+                    story.append(Paragraph("<br/>".join(block), normal_style))
 
             story.append(Spacer(1, 0.5*cm))
 
@@ -160,8 +222,7 @@ class CTDPDFGenerator:
             if gen_data.get("gen_metrics"):
                 story.append(Paragraph("Generation Metrics:", normal_style))
                 metrics = gen_data["gen_metrics"]
-                for key, value in metrics.items():
-                    story.append(Paragraph(f"• {key}: {value}", normal_style))
+                story.append(_bullets((f"{key}: {value}" for key, value in metrics.items()), normal_style))
 
         # 추적 정보
         if result.get("trace"):
@@ -177,14 +238,7 @@ class CTDPDFGenerator:
                 ])
 
             trace_table = Table(trace_data, colWidths=[2*cm, 8*cm, 2*cm])
-            trace_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c5f7c')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ]))
+            trace_table.setStyle(_TRACE_TABLE_STYLE)
             story.append(trace_table)
 
         # PDF 생성
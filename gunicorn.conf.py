@@ -0,0 +1,17 @@
+# gunicorn.conf.py
+# 실행: gunicorn -c gunicorn.conf.py ctdmate.app.router:app
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+# 기본 1개: 워커마다 Llama/E5 모델을 따로 올리고, 로컬 Qdrant 저장소(QDRANT_PATH)는 한 프로세스만 열 수 있음
+# Qdrant를 서버(QDRANT_URL)로 띄운 경우에만 WEB_CONCURRENCY로 늘릴 것 (작업 상태는 output/.jobs로 워커 간 공유)
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def post_fork(server, worker):
+    """워커별로 모델/Qdrant 연결 생성 (앱은 fork 이후 각 워커에서 import)"""
+    from ctdmate.app.router import warmup
+
+    warmup()
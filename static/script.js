@@ -557,7 +557,9 @@ async function handleGenerate() {
             throw new Error(error.detail || 'Failed to generate CTD document');
         }
 
-        const result = await response.json();
+        // 작업 완료까지 폴링
+        const { job_id } = await response.json();
+        const result = await waitForJob(job_id);
 
         // Agent 모드 저장
         currentMode = result.mode || "generate";
@@ -648,6 +650,7 @@ async function handleGenerate() {
             if (result.pdf) {
                 currentPdfUrl = result.pdf.download_url;
                 window.currentPdfFilename = result.pdf.filename;
+                window.currentPreviewUrl = result.pdf.preview_url;
             }
         } else {
             // 검증 모드: 생성 단계 건너뛰기
@@ -723,7 +726,10 @@ function handleConfirm() {
             pdfSection.style.display = 'block';
             validationSection.style.display = 'none';
 
-            if (window.currentPdfFilename) {
+            if (window.currentPreviewUrl) {
+                // 캐시된 결과면 preview_url에 ?cache=<key>가 붙어 있음
+                pdfFrame.src = window.currentPreviewUrl;
+            } else if (window.currentPdfFilename) {
                 pdfFrame.src = `/v1/preview/${window.currentPdfFilename}`;
             }
         }
@@ -795,6 +801,21 @@ function handleDownload() {
     }
 }
 
+// CTD 생성 작업 결과 폴링
+async function waitForJob(jobId, intervalMs = 1000) {
+    while (true) {
+        const response = await fetch(`/v1/jobs/${jobId}`);
+        const job = await response.json();
+        if (!response.ok || job.status === 'error') {
+            throw new Error(job.detail || 'Failed to generate CTD document');
+        }
+        if (job.status === 'done') {
+            return job.result;
+        }
+        await sleep(intervalMs);
+    }
+}
+
 // Sleep utility
 function sleep(ms) {
     return new Promise(resolve => setTimeout(resolve, ms));